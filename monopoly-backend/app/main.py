@@ -1,17 +1,390 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response
+from starlette.datastructures import Headers, MutableHeaders
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from enum import Enum
 from datetime import datetime
+from contextlib import asynccontextmanager, contextmanager
+import asyncio
+import contextvars
+import threading
+import sys
 import os
 import json
+import gzip
+import time
+import itertools
+import math
+import random
+import logging
+import urllib.request
+import functools
+from urllib.parse import parse_qs
+import hashlib
+import bisect
+import heapq
+import re
+import copy
+from collections import Counter, OrderedDict, deque
+from .snapshot_diff import compare_snapshots
+
+try:
+    import orjson
+except ImportError:  # optional, see the "fast" extra in pyproject.toml
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional, see the "fast" extra in pyproject.toml
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+SAVE_FILE = os.environ.get("SAVE_FILE", os.path.join(os.path.dirname(__file__), "..", "game_state.json"))
+
+# Saves are coalesced: state is flushed at most once per interval, or sooner once
+# this many mutations are pending. An interval of 0 writes through on every mutation.
+SAVE_INTERVAL_SECONDS = float(os.environ.get("SAVE_INTERVAL_SECONDS", "1.0"))
+SAVE_MAX_PENDING_MUTATIONS = int(os.environ.get("SAVE_MAX_PENDING_MUTATIONS", "25"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.path.exists(STATIC_DIR):
+        precompress_static_assets(os.path.join(STATIC_DIR, "assets"))
+    save_scheduler.start()
+    standings_reporter.start()
+    try:
+        yield
+    finally:
+        await standings_reporter.stop()
+        await save_scheduler.stop()
+
+def dumps_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    # Compact output, serialized with orjson when it is installed
+    def render(self, content) -> bytes:
+        with request_span("serialization"):
+            return dumps_json(content)
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+class StateReturnMiddleware:
+    # A mutation called with ?return=delta also gets back the parts of the /game/state payload
+    # it changed plus the transactions it recorded (?return=state sends the whole payload), so
+    # the client can skip refetching /game/state and /transactions after every action. The
+    # client passes the revision it last saw; if anything else has changed the game since, a
+    # delta would leave it with gaps, so it is told its copy is stale and must refetch instead.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+        query = parse_qs(scope.get("query_string", b"").decode())
+        mode = query.get("return", [None])[0]
+        if mode not in ("delta", "state"):
+            await self.app(scope, receive, send)
+            return
+
+        up_to_date = query.get("revision", [None])[0] == state_revision()
+        before_view = game_state_view(game_state) if mode == "delta" and up_to_date else None
+        first_transaction_id = game_state.next_transaction_id
+        start_message = None
+        body = b""
+
+        async def send_with_state(message):
+            nonlocal start_message, body
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            body += message.get("body", b"")
+            if message.get("more_body", False):
+                return
+            headers = MutableHeaders(raw=start_message["headers"])
+            if 200 <= start_message["status"] < 300 and headers.get("content-type", "").startswith("application/json"):
+                with request_span("serialization"):
+                    content = json.loads(body) if body else None
+                    if isinstance(content, dict):
+                        content.update(state_payload(mode, up_to_date, before_view, first_transaction_id))
+                        body = dumps_json(content)
+                        headers["Content-Length"] = str(len(body))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_state)
+
+def state_payload(mode: str, up_to_date: bool, before_view: Optional[dict], first_transaction_id: int) -> dict:
+    after_view = game_state_view(game_state)
+    if not up_to_date:
+        payload = {"revision": state_revision(), "state_stale": True}
+        if mode == "state":
+            payload["state"] = after_view
+        return payload
+    # Transaction ids restart after a reset, in which case the client must replace its log
+    replaced = game_state.next_transaction_id < first_transaction_id
+    new_transactions = [t.model_dump() for t in game_state.transactions if replaced or t.id >= first_transaction_id]
+    payload = {
+        "revision": state_revision(),
+        "new_transactions": new_transactions,
+        "transactions_replaced": replaced,
+        "log_id": transaction_log_id(),
+    }
+    if mode == "state":
+        payload["state"] = after_view
+    else:
+        payload["state_delta"] = {k: v for k, v in after_view.items() if before_view.get(k) != v}
+    return payload
+
+app.add_middleware(StateReturnMiddleware)
+
+# Token-bucket limits on mutating requests, shared by the whole game and per client address.
+# Each mutation rewrites state to disk, so one spamming client must not starve the table.
+RATE_LIMIT_GAME_PER_SECOND = float(os.environ.get("RATE_LIMIT_GAME_PER_SECOND", "20"))
+RATE_LIMIT_GAME_BURST = float(os.environ.get("RATE_LIMIT_GAME_BURST", "40"))
+RATE_LIMIT_CLIENT_PER_SECOND = float(os.environ.get("RATE_LIMIT_CLIENT_PER_SECOND", "5"))
+RATE_LIMIT_CLIENT_BURST = float(os.environ.get("RATE_LIMIT_CLIENT_BURST", "15"))
+# Tournament requests (table standings reports, mostly) never touch this game's state, so they
+# get a bucket of their own instead of competing with the table's players
+RATE_LIMIT_TOURNAMENT_PER_SECOND = float(os.environ.get("RATE_LIMIT_TOURNAMENT_PER_SECOND", "50"))
+RATE_LIMIT_TOURNAMENT_BURST = float(os.environ.get("RATE_LIMIT_TOURNAMENT_BURST", "100"))
+TOURNAMENT_PATH_PREFIX = "/tournaments"
+MAX_PENDING_REQUESTS = int(os.environ.get("MAX_PENDING_REQUESTS", "64"))
+MAX_TRACKED_CLIENTS = 1024
+MUTATING_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def retry_after(self) -> int:
+        return max(1, int((1 - self.tokens) / self.rate + 0.999)) if self.rate > 0 else 60
+
+class AdmissionController:
+    def __init__(self):
+        self.game_bucket = TokenBucket(RATE_LIMIT_GAME_PER_SECOND, RATE_LIMIT_GAME_BURST)
+        self.tournament_bucket = TokenBucket(RATE_LIMIT_TOURNAMENT_PER_SECOND, RATE_LIMIT_TOURNAMENT_BURST)
+        self.client_buckets: dict[str, TokenBucket] = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.admitted = 0
+        self.rejected_game = 0
+        self.rejected_tournament = 0
+        self.rejected_client = 0
+        self.shed = 0
+
+    def client_bucket(self, client: str) -> TokenBucket:
+        bucket = self.client_buckets.pop(client, None)
+        if bucket is None:
+            bucket = TokenBucket(RATE_LIMIT_CLIENT_PER_SECOND, RATE_LIMIT_CLIENT_BURST)
+            if len(self.client_buckets) >= MAX_TRACKED_CLIENTS:
+                del self.client_buckets[next(iter(self.client_buckets))]
+        # Re-inserted so the dict stays ordered from least to most recently seen
+        self.client_buckets[client] = bucket
+        return bucket
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_pending": MAX_PENDING_REQUESTS,
+            "admitted": self.admitted,
+            "rejected_game": self.rejected_game,
+            "rejected_tournament": self.rejected_tournament,
+            "rejected_client": self.rejected_client,
+            "shed": self.shed,
+            "game_tokens": round(self.game_bucket.tokens, 2),
+            "tournament_tokens": round(self.tournament_bucket.tokens, 2),
+            "tracked_clients": len(self.client_buckets),
+        }
+
+admission_controller = AdmissionController()
+
+class AdmissionControlMiddleware:
+    def __init__(self, app, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+        controller = self.controller
+        client = scope["client"][0] if scope.get("client") else "unknown"
+        if controller.in_flight >= MAX_PENDING_REQUESTS:
+            controller.shed += 1
+            await self.reject(send, "Server busy, try again shortly", 1)
+            return
+        client_bucket = controller.client_bucket(client)
+        if not client_bucket.take():
+            controller.rejected_client += 1
+            await self.reject(send, "Too many requests from this client", client_bucket.retry_after())
+            return
+        path = scope["path"]
+        if path == TOURNAMENT_PATH_PREFIX or path.startswith(TOURNAMENT_PATH_PREFIX + "/"):
+            if not controller.tournament_bucket.take():
+                controller.rejected_tournament += 1
+                await self.reject(send, "Too many tournament requests", controller.tournament_bucket.retry_after())
+                return
+        elif not controller.game_bucket.take():
+            controller.rejected_game += 1
+            await self.reject(send, "Too many requests for this game", controller.game_bucket.retry_after())
+            return
+        controller.admitted += 1
+        controller.in_flight += 1
+        controller.peak_in_flight = max(controller.peak_in_flight, controller.in_flight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.in_flight -= 1
+
+    async def reject(self, send, detail: str, retry_after: int):
+        body = dumps_json({"detail": detail})
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+app.add_middleware(AdmissionControlMiddleware)
+
+# Mutations carrying an Idempotency-Key header are answered once; a retry with the same key
+# gets the stored response back without running the handler or touching saved state again
+IDEMPOTENCY_CACHE_SIZE = int(os.environ.get("IDEMPOTENCY_CACHE_SIZE", "1024"))
+IDEMPOTENCY_TTL_SECONDS = float(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "600"))
+IDEMPOTENCY_UNCACHED_STATUSES = (408, 409, 425, 429)
+
+class IdempotencyCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict[str, dict] = OrderedDict()
+        self.hits = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires"] < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: dict):
+        entry["expires"] = time.monotonic() + self.ttl
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def discard(self, key: str):
+        self.entries.pop(key, None)
+
+idempotency_cache = IdempotencyCache(IDEMPOTENCY_CACHE_SIZE, IDEMPOTENCY_TTL_SECONDS)
+
+class IdempotencyMiddleware:
+    def __init__(self, app, cache: IdempotencyCache = idempotency_cache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+        key = Headers(scope=scope).get("idempotency-key")
+        if not key:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        fingerprint = hashlib.sha256(
+            b"\0".join([scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body])
+        ).hexdigest()
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            if entry["fingerprint"] != fingerprint:
+                await self.respond(send, 422, [], dumps_json({"detail": "Idempotency-Key was already used for a different request"}))
+            elif entry["status"] is None:
+                await self.respond(send, 409, [], dumps_json({"detail": "A request with this Idempotency-Key is still in progress"}))
+            else:
+                self.cache.hits += 1
+                await self.respond(send, entry["status"], entry["headers"] + [(b"idempotent-replayed", b"true")], entry["body"])
+            return
+
+        entry = {"fingerprint": fingerprint, "status": None, "headers": [], "body": b""}
+        self.cache.put(key, entry)
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def send_and_record(message):
+            if message["type"] == "http.response.start":
+                entry["pending_status"] = message["status"]
+                entry["headers"] = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"content-length"]
+            elif message["type"] == "http.response.body":
+                entry["body"] += message.get("body", b"")
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_and_record)
+        finally:
+            status = entry.pop("pending_status", None)
+            # Server errors and transient rejections (rate limiting, conflicts) aren't cached so
+            # that a retry gets a fresh attempt
+            if status is None or status >= 500 or status in IDEMPOTENCY_UNCACHED_STATUSES:
+                self.cache.discard(key)
+            else:
+                entry["status"] = status
+
+    async def respond(self, send, status: int, headers: list, body: bytes):
+        headers = [(k, v) for k, v in headers if k.lower() not in (b"content-length", b"content-type")]
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers + [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
 
-SAVE_FILE = os.path.join(os.path.dirname(__file__), "..", "game_state.json")
-
-app = FastAPI()
+app.add_middleware(IdempotencyMiddleware)
 
 # Disable CORS. Do not remove this for full-stack development.
 app.add_middleware(
@@ -22,6 +395,211 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Responses smaller than this are sent uncompressed; the framing overhead isn't worth it
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    encodings = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        encodings.add(name.strip())
+    return encodings
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+class CompressionMiddleware:
+    # Compresses single-chunk responses (all of the JSON API) with brotli when available,
+    # otherwise gzip. Streamed and already-encoded responses pass through untouched.
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if ("content-encoding" in headers or message["status"] == 206
+                        or not headers.get("content-type", "").startswith(COMPRESSIBLE_CONTENT_TYPES)):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            if passthrough or start_message is None:
+                await send(message)
+                return
+            passthrough = True
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                body = message.get("body", b"")
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if len(body) >= self.minimum_size:
+                    with request_span("compression"):
+                        body = compress_body(body, encoding)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    message = {**message, "body": body}
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+app.add_middleware(CompressionMiddleware)
+
+# Opt-in profiling. With PROFILING_ENABLED set, every request is timed and broken down into
+# spans (serialization, persistence, compression, and the handler itself as the remainder);
+# requests slower than SLOW_REQUEST_MS are logged with that breakdown.
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", "250"))
+SLOW_REQUEST_LOG_SIZE = 100
+PROFILE_MAX_SECONDS = 60
+
+request_spans: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("request_spans", default=None)
+
+@contextmanager
+def request_span(name: str):
+    spans = request_spans.get()
+    if spans is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans[name] = spans.get(name, 0.0) + time.perf_counter() - start
+
+class RequestProfiler:
+    def __init__(self, slow_threshold_ms: float, log_size: int):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.slow_requests: deque = deque(maxlen=log_size)
+        self.request_count = 0
+        self.slow_count = 0
+        self.span_totals_ms: Counter = Counter()
+        # Work done off the request path (e.g. the debounced save), which no request pays for
+        self.background_counts: Counter = Counter()
+        self.background_totals_ms: Counter = Counter()
+        self.background_max_ms: dict = {}
+
+    def record_background(self, name: str, elapsed: float):
+        elapsed_ms = round(elapsed * 1000, 3)
+        self.background_counts[name] += 1
+        self.background_totals_ms[name] += elapsed_ms
+        self.background_max_ms[name] = max(self.background_max_ms.get(name, 0.0), elapsed_ms)
+        if elapsed_ms >= self.slow_threshold_ms:
+            logger.warning("Slow background %s took %.1fms", name, elapsed_ms)
+
+    def record(self, method: str, path: str, status: Optional[int], elapsed: float, spans: dict):
+        breakdown = {name: round(seconds * 1000, 3) for name, seconds in spans.items()}
+        total_ms = round(elapsed * 1000, 3)
+        breakdown["handler"] = round(max(0.0, total_ms - sum(breakdown.values())), 3)
+        self.request_count += 1
+        self.span_totals_ms.update(breakdown)
+        if total_ms < self.slow_threshold_ms:
+            return
+        self.slow_count += 1
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "method": method,
+            "path": path,
+            "status": status,
+            "total_ms": total_ms,
+            "spans_ms": breakdown,
+        }
+        self.slow_requests.append(entry)
+        logger.warning("Slow request %s %s took %.1fms: %s", method, path, total_ms, breakdown)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.request_count,
+            "slow_requests": self.slow_count,
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "span_totals_ms": {name: round(ms, 3) for name, ms in self.span_totals_ms.items()},
+            "background_ms": {
+                name: {
+                    "count": count,
+                    "total_ms": round(self.background_totals_ms[name], 3),
+                    "max_ms": self.background_max_ms[name],
+                }
+                for name, count in self.background_counts.items()
+            },
+        }
+
+request_profiler = RequestProfiler(SLOW_REQUEST_MS, SLOW_REQUEST_LOG_SIZE)
+
+class RequestTimingMiddleware:
+    # Outermost, so the total covers everything the server does for the request
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        spans: dict = {}
+        token = request_spans.set(spans)
+        status = None
+        start = time.perf_counter()
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            request_spans.reset(token)
+            request_profiler.record(scope["method"], scope["path"], status, time.perf_counter() - start, spans)
+
+if PROFILING_ENABLED:
+    app.add_middleware(RequestTimingMiddleware)
+
+def sample_stacks(seconds: float, interval: float) -> Counter:
+    # Samples every other thread's Python stack, keyed in collapsed-stack form
+    # ("thread;outer;...;inner") so the counts feed straight into flamegraph tools
+    sampler_id = threading.get_ident()
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == sampler_id:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            frames.append(thread_names.get(thread_id, str(thread_id)))
+            stacks[";".join(reversed(frames))] += 1
+        time.sleep(interval)
+    return stacks
+
+profile_lock = asyncio.Lock()
+
 class PropertyType(str, Enum):
     PROPERTY = "property"
     STATION = "station"
@@ -39,295 +617,125 @@ class PropertyColor(str, Enum):
     STATION = "station"
     UTILITY = "utility"
 
-PROPERTIES_DATA = {
-    "old_kent_road": {
-        "name": "Old Kent Road",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.BROWN,
-        "purchase_cost": 60,
-        "mortgage_value": 30,
-        "house_cost": 50,
-        "rent": {"0": 2, "1": 10, "2": 30, "3": 90, "4": 160, "hotel": 250}
-    },
-    "whitechapel_road": {
-        "name": "Whitechapel Road",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.BROWN,
-        "purchase_cost": 60,
-        "mortgage_value": 30,
-        "house_cost": 50,
-        "rent": {"0": 4, "1": 20, "2": 60, "3": 180, "4": 320, "hotel": 450}
-    },
-    "angel_islington": {
-        "name": "The Angel Islington",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.LIGHT_BLUE,
-        "purchase_cost": 100,
-        "mortgage_value": 50,
-        "house_cost": 50,
-        "rent": {"0": 6, "1": 30, "2": 90, "3": 270, "4": 400, "hotel": 550}
-    },
-    "euston_road": {
-        "name": "Euston Road",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.LIGHT_BLUE,
-        "purchase_cost": 100,
-        "mortgage_value": 50,
-        "house_cost": 50,
-        "rent": {"0": 6, "1": 30, "2": 90, "3": 270, "4": 400, "hotel": 550}
-    },
-    "pentonville_road": {
-        "name": "Pentonville Road",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.LIGHT_BLUE,
-        "purchase_cost": 120,
-        "mortgage_value": 60,
-        "house_cost": 50,
-        "rent": {"0": 8, "1": 40, "2": 100, "3": 300, "4": 450, "hotel": 600}
-    },
-    "pall_mall": {
-        "name": "Pall Mall",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.PINK,
-        "purchase_cost": 140,
-        "mortgage_value": 70,
-        "house_cost": 100,
-        "rent": {"0": 10, "1": 50, "2": 150, "3": 450, "4": 625, "hotel": 750}
-    },
-    "whitehall": {
-        "name": "Whitehall",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.PINK,
-        "purchase_cost": 140,
-        "mortgage_value": 70,
-        "house_cost": 100,
-        "rent": {"0": 10, "1": 50, "2": 150, "3": 450, "4": 625, "hotel": 750}
-    },
-    "northumberland_avenue": {
-        "name": "Northumberland Avenue",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.PINK,
-        "purchase_cost": 160,
-        "mortgage_value": 80,
-        "house_cost": 100,
-        "rent": {"0": 12, "1": 60, "2": 180, "3": 500, "4": 700, "hotel": 900}
-    },
-    "bow_street": {
-        "name": "Bow Street",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.ORANGE,
-        "purchase_cost": 180,
-        "mortgage_value": 90,
-        "house_cost": 100,
-        "rent": {"0": 14, "1": 70, "2": 200, "3": 550, "4": 750, "hotel": 950}
-    },
-    "marlborough_street": {
-        "name": "Marlborough Street",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.ORANGE,
-        "purchase_cost": 180,
-        "mortgage_value": 90,
-        "house_cost": 100,
-        "rent": {"0": 14, "1": 70, "2": 200, "3": 550, "4": 750, "hotel": 950}
-    },
-    "vine_street": {
-        "name": "Vine Street",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.ORANGE,
-        "purchase_cost": 200,
-        "mortgage_value": 100,
-        "house_cost": 100,
-        "rent": {"0": 16, "1": 80, "2": 220, "3": 600, "4": 800, "hotel": 1000}
-    },
-    "strand": {
-        "name": "Strand",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.RED,
-        "purchase_cost": 220,
-        "mortgage_value": 110,
-        "house_cost": 150,
-        "rent": {"0": 18, "1": 90, "2": 250, "3": 700, "4": 875, "hotel": 1050}
-    },
-    "fleet_street": {
-        "name": "Fleet Street",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.RED,
-        "purchase_cost": 220,
-        "mortgage_value": 110,
-        "house_cost": 150,
-        "rent": {"0": 18, "1": 90, "2": 250, "3": 700, "4": 875, "hotel": 1050}
-    },
-    "trafalgar_square": {
-        "name": "Trafalgar Square",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.RED,
-        "purchase_cost": 240,
-        "mortgage_value": 120,
-        "house_cost": 150,
-        "rent": {"0": 20, "1": 100, "2": 300, "3": 750, "4": 925, "hotel": 1100}
-    },
-    "leicester_square": {
-        "name": "Leicester Square",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.YELLOW,
-        "purchase_cost": 260,
-        "mortgage_value": 130,
-        "house_cost": 150,
-        "rent": {"0": 22, "1": 110, "2": 330, "3": 800, "4": 975, "hotel": 1150}
-    },
-    "coventry_street": {
-        "name": "Coventry Street",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.YELLOW,
-        "purchase_cost": 260,
-        "mortgage_value": 130,
-        "house_cost": 150,
-        "rent": {"0": 22, "1": 110, "2": 330, "3": 800, "4": 975, "hotel": 1150}
-    },
-    "piccadilly": {
-        "name": "Piccadilly",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.YELLOW,
-        "purchase_cost": 280,
-        "mortgage_value": 140,
-        "house_cost": 150,
-        "rent": {"0": 24, "1": 120, "2": 360, "3": 850, "4": 1025, "hotel": 1200}
-    },
-    "regent_street": {
-        "name": "Regent Street",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.GREEN,
-        "purchase_cost": 300,
-        "mortgage_value": 150,
-        "house_cost": 200,
-        "rent": {"0": 26, "1": 130, "2": 390, "3": 900, "4": 1100, "hotel": 1275}
-    },
-    "oxford_street": {
-        "name": "Oxford Street",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.GREEN,
-        "purchase_cost": 300,
-        "mortgage_value": 150,
-        "house_cost": 200,
-        "rent": {"0": 26, "1": 130, "2": 390, "3": 900, "4": 1100, "hotel": 1275}
-    },
-    "bond_street": {
-        "name": "Bond Street",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.GREEN,
-        "purchase_cost": 320,
-        "mortgage_value": 160,
-        "house_cost": 200,
-        "rent": {"0": 28, "1": 150, "2": 450, "3": 1000, "4": 1200, "hotel": 1400}
-    },
-    "park_lane": {
-        "name": "Park Lane",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.DARK_BLUE,
-        "purchase_cost": 350,
-        "mortgage_value": 175,
-        "house_cost": 200,
-        "rent": {"0": 35, "1": 175, "2": 500, "3": 1100, "4": 1300, "hotel": 1500}
-    },
-    "mayfair": {
-        "name": "Mayfair",
-        "type": PropertyType.PROPERTY,
-        "color": PropertyColor.DARK_BLUE,
-        "purchase_cost": 400,
-        "mortgage_value": 200,
-        "house_cost": 200,
-        "rent": {"0": 50, "1": 200, "2": 600, "3": 1400, "4": 1700, "hotel": 2000}
-    },
-    "kings_cross_station": {
-        "name": "King's Cross Station",
-        "type": PropertyType.STATION,
-        "color": PropertyColor.STATION,
-        "purchase_cost": 200,
-        "mortgage_value": 100
-    },
-    "marylebone_station": {
-        "name": "Marylebone Station",
-        "type": PropertyType.STATION,
-        "color": PropertyColor.STATION,
-        "purchase_cost": 200,
-        "mortgage_value": 100
-    },
-    "fenchurch_street_station": {
-        "name": "Fenchurch Street Station",
-        "type": PropertyType.STATION,
-        "color": PropertyColor.STATION,
-        "purchase_cost": 200,
-        "mortgage_value": 100
-    },
-    "liverpool_street_station": {
-        "name": "Liverpool Street Station",
-        "type": PropertyType.STATION,
-        "color": PropertyColor.STATION,
-        "purchase_cost": 200,
-        "mortgage_value": 100
-    },
-    "electric_company": {
-        "name": "Electric Company",
-        "type": PropertyType.UTILITY,
-        "color": PropertyColor.UTILITY,
-        "purchase_cost": 150,
-        "mortgage_value": 75
-    },
-    "water_works": {
-        "name": "Water Works",
-        "type": PropertyType.UTILITY,
-        "color": PropertyColor.UTILITY,
-        "purchase_cost": 150,
-        "mortgage_value": 75
-    }
-}
-
-STATION_RENT = {1: 25, 2: 50, 3: 100, 4: 200}
-
-GAME_VERSIONS = ["london", "edinburgh"]
-
-EDINBURGH_NAMES = {
-    "old_kent_road": "Arthurs Seat",
-    "whitechapel_road": "Calton Hill",
-    "angel_islington": "Museum Of Childhood",
-    "euston_road": "Museum of Edinburgh",
-    "pentonville_road": "Edinburgh Zoo",
-    "pall_mall": "Heart of Midlothian FC",
-    "whitehall": "Hibernian FC",
-    "northumberland_avenue": "Murrayfield",
-    "bow_street": "Edinburgh St James",
-    "marlborough_street": "Omni",
-    "vine_street": "Multrees Walk",
-    "strand": "Princes Street",
-    "fleet_street": "Edinburgh News",
-    "trafalgar_square": "Royal Mile",
-    "leicester_square": "The Caledonian",
-    "coventry_street": "Scottish Parliament",
-    "piccadilly": "The Fringe",
-    "regent_street": "George Watson College",
-    "oxford_street": "Merchiston Castle School",
-    "bond_street": "University of Edinburgh",
-    "park_lane": "Scott Monument",
-    "mayfair": "Edinburgh Castle",
-    "kings_cross_station": "Edinburgh Airport",
-    "marylebone_station": "Haymarket Station",
-    "fenchurch_street_station": "Forth Bridge",
-    "liverpool_street_station": "Waverley Station",
-    "electric_company": "Scotmid Coop",
-    "water_works": "Water of Leith",
-}
-
+BOARDS_DIR = os.path.join(os.path.dirname(__file__), "boards")
+DEFAULT_BOARD = "london"
+RENT_LEVELS = ["0", "1", "2", "3", "4", "hotel"]
+SPECIAL_SQUARES = {"go", "jail", "free_parking", "go_to_jail", "chance", "community_chest", "income_tax", "super_tax"}
+
+class BoardPack:
+    # A board compiled once from its JSON file and shared by every game that uses it
+    def __init__(self, name: str, properties: dict, station_rent: dict[int, int], squares: list[str],
+                 display_names: dict[str, str], extends: Optional[str] = None):
+        self.name = name
+        self.extends = extends
+        self.properties = properties
+        self.station_rent = station_rent
+        self.squares = squares
+        self.display_names = display_names
+        self.groups: dict[PropertyColor, list[str]] = {}
+        for prop_id, data in properties.items():
+            self.groups.setdefault(data["color"], []).append(prop_id)
+        # Property data with enums already converted and this pack's names filled in, ready to serialize
+        self.json_properties = {
+            prop_id: {**{k: (v.value if isinstance(v, Enum) else v) for k, v in data.items()}, "name": display_names[prop_id]}
+            for prop_id, data in properties.items()
+        }
+
+def compile_board(name: str, raw: dict) -> BoardPack:
+    properties = {}
+    raw_properties = raw.get("properties")
+    if not isinstance(raw_properties, dict) or not raw_properties:
+        raise ValueError(f"Board pack {name}: 'properties' must be a non-empty object")
+    for prop_id, data in raw_properties.items():
+        try:
+            prop = {
+                "name": str(data["name"]),
+                "type": PropertyType(data["type"]),
+                "color": PropertyColor(data["color"]),
+                "purchase_cost": int(data["purchase_cost"]),
+                "mortgage_value": int(data["mortgage_value"]),
+            }
+            if prop["type"] == PropertyType.PROPERTY:
+                prop["house_cost"] = int(data["house_cost"])
+                prop["rent"] = {level: int(data["rent"][level]) for level in RENT_LEVELS}
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Board pack {name}: invalid property {prop_id}: {e}") from e
+        if not 0 < prop["mortgage_value"] <= prop["purchase_cost"]:
+            raise ValueError(f"Board pack {name}: {prop_id} mortgage value must be between 1 and its purchase cost")
+        properties[prop_id] = prop
+    
+    try:
+        station_rent = {int(k): int(v) for k, v in raw["station_rent"].items()}
+    except (KeyError, AttributeError, TypeError, ValueError) as e:
+        raise ValueError(f"Board pack {name}: invalid station_rent: {e}") from e
+    
+    squares = raw.get("squares")
+    if not isinstance(squares, list) or not squares or squares[0] != "go" or "jail" not in squares:
+        raise ValueError(f"Board pack {name}: 'squares' must start at go and include jail")
+    for square in squares:
+        if square not in properties and square not in SPECIAL_SQUARES:
+            raise ValueError(f"Board pack {name}: unknown square {square}")
+    missing = [prop_id for prop_id in properties if squares.count(prop_id) != 1]
+    if missing:
+        raise ValueError(f"Board pack {name}: properties must appear on the board exactly once: {missing}")
+    
+    return BoardPack(name, properties, station_rent, squares, {prop_id: p["name"] for prop_id, p in properties.items()})
+
+@functools.lru_cache(maxsize=None)
+def load_board_pack(name: str) -> BoardPack:
+    path = os.path.join(BOARDS_DIR, f"{name}.json")
+    if not os.path.isfile(path):
+        raise ValueError(f"Unknown board pack: {name}")
+    with open(path, "rb") as f:
+        raw = json.loads(f.read())
+    if not isinstance(raw, dict):
+        raise ValueError(f"Board pack {name}: must be a JSON object")
+    if "extends" not in raw:
+        return compile_board(name, raw)
+    
+    # An edition: another board's rules under its own names
+    base = load_board_pack(raw["extends"])
+    if base.extends is not None:
+        raise ValueError(f"Board pack {name}: cannot extend {base.name}, which is itself an edition")
+    names = raw.get("names", {})
+    unknown = [prop_id for prop_id in names if prop_id not in base.properties]
+    if unknown:
+        raise ValueError(f"Board pack {name}: names given for unknown properties: {unknown}")
+    return BoardPack(name, base.properties, base.station_rent, base.squares, {**base.display_names, **names}, extends=base.name)
+
+BASE_BOARD = load_board_pack(DEFAULT_BOARD)
+
+def available_board_packs() -> list[str]:
+    # Game rules run on the base board, so every selectable version must be an edition of it;
+    # each pack is compiled and checked once here rather than on first use. A broken pack is
+    # left out with a warning instead of stopping the server.
+    versions = [DEFAULT_BOARD]
+    for name in sorted(f[:-len(".json")] for f in os.listdir(BOARDS_DIR) if f.endswith(".json")):
+        if name == DEFAULT_BOARD:
+            continue
+        try:
+            pack = load_board_pack(name)
+        except (OSError, ValueError, RecursionError) as e:
+            logger.warning("Skipping board pack %s: %s", name, e)
+            continue
+        if pack.properties is not BASE_BOARD.properties:
+            logger.warning("Skipping board pack %s: it must extend %s", name, DEFAULT_BOARD)
+            continue
+        versions.append(name)
+    return versions
+
+GAME_VERSIONS = available_board_packs()
+
+PROPERTIES_DATA = BASE_BOARD.properties
+STATION_RENT = BASE_BOARD.station_rent
 COLOR_GROUPS = {
-    PropertyColor.BROWN: ["old_kent_road", "whitechapel_road"],
-    PropertyColor.LIGHT_BLUE: ["angel_islington", "euston_road", "pentonville_road"],
-    PropertyColor.PINK: ["pall_mall", "whitehall", "northumberland_avenue"],
-    PropertyColor.ORANGE: ["bow_street", "marlborough_street", "vine_street"],
-    PropertyColor.RED: ["strand", "fleet_street", "trafalgar_square"],
-    PropertyColor.YELLOW: ["leicester_square", "coventry_street", "piccadilly"],
-    PropertyColor.GREEN: ["regent_street", "oxford_street", "bond_street"],
-    PropertyColor.DARK_BLUE: ["park_lane", "mayfair"],
+    color: prop_ids for color, prop_ids in BASE_BOARD.groups.items()
+    if color not in (PropertyColor.STATION, PropertyColor.UTILITY)
 }
 
+BANK_HOUSES = 32
+BANK_HOTELS = 12
+
 class Player(BaseModel):
     id: int
     name: str
@@ -348,6 +756,52 @@ class Transaction(BaseModel):
     to_entity: str
     amount: int
     description: str
+    property_id: Optional[str] = None
+
+class Debt(BaseModel):
+    id: int
+    from_player_id: Optional[int] = None
+    to_player_id: Optional[int] = None
+    amount: int
+    description: str = ""
+    timestamp: str
+
+# Recurring payments fire when the turn counter (every /turn/next) or the round counter (each
+# time play comes back round to the first player) reaches their next_due value
+PAYMENT_UNITS = ("turn", "round")
+# Saves from before rounds were called rounds
+LEGACY_PAYMENT_UNITS = {"lap": "round"}
+
+class ScheduledPayment(BaseModel):
+    id: int
+    from_player_id: Optional[int] = None
+    to_player_id: Optional[int] = None
+    is_fine: bool = False
+    amount: int
+    description: str = ""
+    unit: str
+    every: int
+    next_due: int
+    remaining: Optional[int] = None
+
+class Loan(BaseModel):
+    id: int
+    lender_id: Optional[int] = None
+    borrower_id: int
+    principal: int
+    # Simple interest, in percent of the outstanding principal per turn
+    rate: float = 0
+    start_turn: int
+    due_turn: int
+    # Principal still outstanding since balance_turn
+    balance: int
+    balance_turn: int
+    # Interest accrued up to balance_turn, unrounded so repeated repayments don't lose
+    # fractions of a pound, and how much of it has been paid
+    interest_to_date: float = 0
+    interest_paid: int = 0
+    description: str = ""
+    timestamp: str
 
 class GameState:
     def __init__(self):
@@ -361,49 +815,341 @@ class GameState:
         self.next_transaction_id: int = 1
         self.turn_order: list[int] = []
         self.current_turn_index: int = 0
+        self.bank_houses: int = BANK_HOUSES
+        self.bank_hotels: int = BANK_HOTELS
+        self.debts: list[Debt] = []
+        self.next_debt_id: int = 1
+        self.positions: dict[int, int] = {}
+        self.turn_count: int = 0
+        self.round_count: int = 0
+        self.scheduled_payments: dict[int, ScheduledPayment] = {}
+        self.next_scheduled_payment_id: int = 1
+        self.loans: dict[int, Loan] = {}
+        self.next_loan_id: int = 1
+        # Min-heaps of (next_due, payment_id) per unit; entries for cancelled payments are
+        # skipped when popped rather than searched for and removed
+        self.payment_queues: dict[str, list[tuple[int, int]]] = {unit: [] for unit in PAYMENT_UNITS}
+
+    def queue_payment(self, payment: ScheduledPayment):
+        heapq.heappush(self.payment_queues[payment.unit], (payment.next_due, payment.id))
+
+    def rebuild_payment_queues(self):
+        self.payment_queues = {unit: [] for unit in PAYMENT_UNITS}
+        for payment in self.scheduled_payments.values():
+            self.payment_queues[payment.unit].append((payment.next_due, payment.id))
+        for queue in self.payment_queues.values():
+            heapq.heapify(queue)
+
+    def recount_bank_buildings(self):
+        self.bank_houses = BANK_HOUSES - sum(p.houses for p in self.owned_properties.values())
+        self.bank_hotels = BANK_HOTELS - sum(1 for p in self.owned_properties.values() if p.has_hotel)
+
+def state_snapshot(state: GameState) -> dict:
+    # Everything except the transaction log, as fresh plain data
+    return {
+        "players": {str(k): v.model_dump() for k, v in state.players.items()},
+        "owned_properties": {k: v.model_dump() for k, v in state.owned_properties.items()},
+        "property_owners": dict(state.property_owners),
+        "free_parking_pot": state.free_parking_pot,
+        "next_player_id": state.next_player_id,
+        "version": state.version,
+        "turn_order": list(state.turn_order),
+        "current_turn_index": state.current_turn_index,
+        "debts": [d.model_dump() for d in state.debts],
+        "next_debt_id": state.next_debt_id,
+        "positions": {str(k): v for k, v in state.positions.items()},
+        "turn_count": state.turn_count,
+        "round_count": state.round_count,
+        "scheduled_payments": {str(k): v.model_dump() for k, v in state.scheduled_payments.items()},
+        "next_scheduled_payment_id": state.next_scheduled_payment_id,
+        "loans": {str(k): v.model_dump() for k, v in state.loans.items()},
+        "next_loan_id": state.next_loan_id,
+    }
 
-def save_game_state():
+def apply_snapshot(state: GameState, data: dict):
+    state.players = {int(k): Player(**v) for k, v in data.get("players", {}).items()}
+    state.owned_properties = {k: OwnedProperty(**v) for k, v in data.get("owned_properties", {}).items()}
+    state.property_owners = dict(data.get("property_owners", {}))
+    state.free_parking_pot = data.get("free_parking_pot", 0)
+    state.next_player_id = data.get("next_player_id", 1)
+    state.version = data.get("version", "london")
+    state.turn_order = list(data.get("turn_order", []))
+    state.current_turn_index = data.get("current_turn_index", 0)
+    state.debts = [Debt(**d) for d in data.get("debts", [])]
+    state.next_debt_id = data.get("next_debt_id", 1)
+    state.positions = {int(k): v for k, v in data.get("positions", {}).items()}
+    state.turn_count = data.get("turn_count", 0)
+    state.round_count = data.get("round_count", data.get("lap_count", 0))
+    state.scheduled_payments = {
+        int(k): ScheduledPayment(**{**v, "unit": LEGACY_PAYMENT_UNITS.get(v.get("unit"), v.get("unit"))})
+        for k, v in data.get("scheduled_payments", {}).items()
+    }
+    state.next_scheduled_payment_id = data.get("next_scheduled_payment_id", 1)
+    state.loans = {int(k): Loan(**v) for k, v in data.get("loans", {}).items()}
+    state.next_loan_id = data.get("next_loan_id", 1)
+    state.rebuild_payment_queues()
+    state.recount_bank_buildings()
+
+def write_game_state():
     data = {
-        "players": {str(k): v.model_dump() for k, v in game_state.players.items()},
-        "owned_properties": {k: v.model_dump() for k, v in game_state.owned_properties.items()},
-        "property_owners": game_state.property_owners,
-        "free_parking_pot": game_state.free_parking_pot,
-        "next_player_id": game_state.next_player_id,
-        "version": game_state.version,
+        **state_snapshot(game_state),
         "transactions": [t.model_dump() for t in game_state.transactions],
         "next_transaction_id": game_state.next_transaction_id,
-        "turn_order": game_state.turn_order,
-        "current_turn_index": game_state.current_turn_index,
     }
-    with open(SAVE_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    tmp_file = SAVE_FILE + ".tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(dumps_json(data))
+    os.replace(tmp_file, SAVE_FILE)
+
+class SaveScheduler:
+    def __init__(self, interval: float, max_pending: int):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.pending_mutations = 0
+        self.flush_count = 0
+        self.task: Optional[asyncio.Task] = None
+        self.dirty = asyncio.Event()
+
+    def mark_dirty(self):
+        self.pending_mutations += 1
+        # Without the background task (e.g. no lifespan) fall back to writing through
+        if self.task is None or self.interval <= 0 or self.pending_mutations >= self.max_pending:
+            self.flush()
+        else:
+            self.dirty.set()
+
+    def flush(self):
+        if self.pending_mutations == 0:
+            return
+        # Inside a request this is already part of its persistence span; from the background
+        # task it is timed on its own
+        in_request = request_spans.get() is not None
+        start = time.perf_counter()
+        try:
+            write_game_state()
+        except Exception:
+            # Keep the mutations pending (and the event set) so the next round retries;
+            # the game itself is still intact in memory
+            logger.exception("Failed to save game state to %s", SAVE_FILE)
+            return
+        self.pending_mutations = 0
+        self.dirty.clear()
+        self.flush_count += 1
+        if PROFILING_ENABLED and not in_request:
+            request_profiler.record_background("save", time.perf_counter() - start)
+
+    async def run(self):
+        while True:
+            await self.dirty.wait()
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    def start(self):
+        if self.task is None and self.interval > 0:
+            self.dirty = asyncio.Event()
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.flush()
+
+save_scheduler = SaveScheduler(SAVE_INTERVAL_SECONDS, SAVE_MAX_PENDING_MUTATIONS)
+
+# In-memory history for /game/state?at=<transaction_id>: a full snapshot every
+# HISTORY_CHECKPOINT_INTERVAL commits and a delta for each commit in between. Smaller
+# intervals answer faster at the cost of more memory.
+HISTORY_CHECKPOINT_INTERVAL = int(os.environ.get("HISTORY_CHECKPOINT_INTERVAL", "50"))
+
+def diff_snapshots(old: dict, new: dict) -> dict:
+    delta = {}
+    for key, value in new.items():
+        before = old.get(key)
+        if isinstance(value, dict):
+            before = before or {}
+            changed = {k: v for k, v in value.items() if k not in before or before[k] != v}
+            removed = [k for k in before if k not in value]
+            if changed or removed:
+                delta[key] = {"set": changed, "del": removed}
+        elif before != value:
+            delta[key] = value
+    return delta
+
+def apply_delta(snapshot: dict, delta: dict):
+    for key, value in delta.items():
+        if isinstance(snapshot.get(key), dict):
+            snapshot[key].update(value["set"])
+            for k in value["del"]:
+                del snapshot[key][k]
+        else:
+            snapshot[key] = value
+
+class StateHistory:
+    def __init__(self, checkpoint_interval: int):
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.revision = 0
+        self.clear()
+
+    def clear(self):
+        # Commit i covers transactions up to last_transaction_ids[i]. The revision counts every
+        # commit for the life of the process and so is deliberately not reset here.
+        self.last_transaction_ids: list[int] = []
+        self.deltas: list[dict] = []
+        self.checkpoints: dict[int, dict] = {}
+        self.last_snapshot: Optional[dict] = None
+
+    def record(self, snapshot: dict, last_transaction_id: int):
+        # Checkpointed commits keep their delta too, so any range of commits can be replayed
+        self.revision += 1
+        index = len(self.deltas)
+        self.deltas.append({} if self.last_snapshot is None else diff_snapshots(self.last_snapshot, snapshot))
+        if self.last_snapshot is None or index % self.checkpoint_interval == 0:
+            self.checkpoints[index] = snapshot
+        self.last_transaction_ids.append(last_transaction_id)
+        self.last_snapshot = snapshot
+
+    def snapshot_at(self, transaction_id: int) -> Optional[dict]:
+        # Latest commit that had recorded no transaction after transaction_id
+        index = bisect.bisect_right(self.last_transaction_ids, transaction_id) - 1
+        if index < 0:
+            return None
+        checkpoint = index - index % self.checkpoint_interval
+        snapshot = copy.deepcopy(self.checkpoints[checkpoint])
+        for delta in self.deltas[checkpoint + 1:index + 1]:
+            apply_delta(snapshot, delta)
+        return snapshot
+
+    def snapshots_between(self, from_transaction_id: int, to_transaction_id: int) -> Optional[tuple[dict, dict]]:
+        # Rebuilds only the earlier state, then rolls a copy forward through the deltas recorded
+        # between the two points instead of rebuilding the later one from its own checkpoint
+        before = self.snapshot_at(from_transaction_id)
+        if before is None:
+            return None
+        start = bisect.bisect_right(self.last_transaction_ids, from_transaction_id) - 1
+        end = bisect.bisect_right(self.last_transaction_ids, to_transaction_id) - 1
+        after = copy.deepcopy(before)
+        for delta in self.deltas[start + 1:end + 1]:
+            apply_delta(after, delta)
+        return before, after
+
+state_history = StateHistory(HISTORY_CHECKPOINT_INTERVAL)
+
+# Identifies this server process, so revisions from before a restart never match
+SERVER_EPOCH = format(time.time_ns(), "x")
+
+def state_revision() -> str:
+    return f"{SERVER_EPOCH}-{state_history.revision}"
+
+def transaction_log_id() -> str:
+    return f"{SERVER_EPOCH}-{transaction_index.generation}"
+
+def save_game_state():
+    with request_span("persistence"):
+        state_history.record(state_snapshot(game_state), game_state.next_transaction_id - 1)
+        save_scheduler.mark_dirty()
+    standings_reporter.notify()
+    spectator_feed.invalidate()
+
+def search_tokens(text: str) -> set[str]:
+    return set(re.findall(r"\w+", text.lower()))
+
+class TransactionIndex:
+    # Inverted indexes over the transaction log, kept up to date as transactions are added.
+    # Postings are positions in game_state.transactions, which only grows (or is cleared), so
+    # every posting list is sorted and the positions also order matches by id and time.
+    def __init__(self):
+        self.generation = 0
+        self.clear()
+
+    def clear(self):
+        # Ids restart once the log is cleared, so readers need to tell the new log from the old
+        self.generation += 1
+        self.by_type: dict[str, list[int]] = {}
+        self.by_from: dict[str, list[int]] = {}
+        self.by_to: dict[str, list[int]] = {}
+        self.by_property: dict[str, list[int]] = {}
+        self.by_token: dict[str, list[int]] = {}
+        self.timestamps: list[str] = []
+        self.amounts: list[tuple[int, int]] = []
+
+    def add(self, position: int, transaction: Transaction):
+        self.by_type.setdefault(transaction.type, []).append(position)
+        self.by_from.setdefault(transaction.from_entity.lower(), []).append(position)
+        self.by_to.setdefault(transaction.to_entity.lower(), []).append(position)
+        if transaction.property_id is not None:
+            self.by_property.setdefault(transaction.property_id, []).append(position)
+        for token in search_tokens(transaction.description):
+            self.by_token.setdefault(token, []).append(position)
+        self.timestamps.append(transaction.timestamp)
+        bisect.insort(self.amounts, (transaction.amount, position))
+
+    def rebuild(self, transactions: list[Transaction]):
+        self.clear()
+        for position, transaction in enumerate(transactions):
+            self.add(position, transaction)
+
+    def search(self, type: Optional[str] = None, from_entity: Optional[str] = None, to_entity: Optional[str] = None,
+               entity: Optional[str] = None, property_id: Optional[str] = None, min_amount: Optional[int] = None,
+               max_amount: Optional[int] = None, since: Optional[str] = None, until: Optional[str] = None,
+               text: Optional[str] = None) -> list[int]:
+        # Each filter narrows to a set of positions; the smallest is intersected with the rest
+        candidates: list[set[int]] = []
+        if type is not None:
+            candidates.append(set(self.by_type.get(type, ())))
+        if from_entity is not None:
+            candidates.append(set(self.by_from.get(from_entity.lower(), ())))
+        if to_entity is not None:
+            candidates.append(set(self.by_to.get(to_entity.lower(), ())))
+        if entity is not None:
+            candidates.append(set(self.by_from.get(entity.lower(), ())) | set(self.by_to.get(entity.lower(), ())))
+        if property_id is not None:
+            candidates.append(set(self.by_property.get(property_id, ())))
+        if text is not None:
+            candidates += [set(self.by_token.get(token, ())) for token in search_tokens(text)]
+        if min_amount is not None or max_amount is not None:
+            low = bisect.bisect_left(self.amounts, (min_amount, -1)) if min_amount is not None else 0
+            high = bisect.bisect_right(self.amounts, (max_amount, math.inf)) if max_amount is not None else len(self.amounts)
+            candidates.append({position for _, position in self.amounts[low:high]})
+
+        # Positions are in time order, so a time window is a contiguous range
+        start = bisect.bisect_left(self.timestamps, since) if since is not None else 0
+        end = bisect.bisect_right(self.timestamps, until) if until is not None else len(self.timestamps)
+        if not candidates:
+            return list(range(start, end))
+        candidates.sort(key=len)
+        matches = candidates[0].intersection(*candidates[1:])
+        return sorted(position for position in matches if start <= position < end)
+
+transaction_index = TransactionIndex()
 
 def load_game_state():
     if not os.path.exists(SAVE_FILE):
         return
     try:
-        with open(SAVE_FILE, "r") as f:
-            data = json.load(f)
-        game_state.players = {int(k): Player(**v) for k, v in data.get("players", {}).items()}
-        game_state.owned_properties = {k: OwnedProperty(**v) for k, v in data.get("owned_properties", {}).items()}
-        game_state.property_owners = data.get("property_owners", {})
-        game_state.free_parking_pot = data.get("free_parking_pot", 0)
-        game_state.next_player_id = data.get("next_player_id", 1)
-        game_state.version = data.get("version", "london")
+        with open(SAVE_FILE, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        apply_snapshot(game_state, data)
         game_state.transactions = [Transaction(**t) for t in data.get("transactions", [])]
         game_state.next_transaction_id = data.get("next_transaction_id", 1)
-        game_state.turn_order = data.get("turn_order", [])
-        game_state.current_turn_index = data.get("current_turn_index", 0)
-    except (json.JSONDecodeError, KeyError, TypeError):
+        transaction_index.rebuild(game_state.transactions)
+    except (ValueError, KeyError, TypeError):
         pass
 
 game_state = GameState()
 load_game_state()
+state_history.record(state_snapshot(game_state), game_state.next_transaction_id - 1)
+
+def board_for(version: str) -> BoardPack:
+    return load_board_pack(version) if version in GAME_VERSIONS else BASE_BOARD
 
 def get_display_name(property_id: str) -> str:
-    if game_state.version == "edinburgh" and property_id in EDINBURGH_NAMES:
-        return EDINBURGH_NAMES[property_id]
-    return PROPERTIES_DATA[property_id]["name"]
+    return board_for(game_state.version).display_names[property_id]
 
 def get_player_name(player_id: Optional[int]) -> str:
     if player_id is None:
@@ -412,7 +1158,8 @@ def get_player_name(player_id: Optional[int]) -> str:
         return game_state.players[player_id].name
     return f"Player {player_id}"
 
-def add_transaction(trans_type: str, from_entity: str, to_entity: str, amount: int, description: str):
+def add_transaction(trans_type: str, from_entity: str, to_entity: str, amount: int, description: str,
+                    property_id: Optional[str] = None):
     transaction = Transaction(
         id=game_state.next_transaction_id,
         timestamp=datetime.now().isoformat(),
@@ -420,8 +1167,10 @@ def add_transaction(trans_type: str, from_entity: str, to_entity: str, amount: i
         from_entity=from_entity,
         to_entity=to_entity,
         amount=amount,
-        description=description
+        description=description,
+        property_id=property_id
     )
+    transaction_index.add(len(game_state.transactions), transaction)
     game_state.transactions.append(transaction)
     game_state.next_transaction_id += 1
 
@@ -491,10 +1240,171 @@ class CashOutRequest(BaseModel):
 class ReorderPlayersRequest(BaseModel):
     turn_order: List[int]
 
+class OpenAuctionRequest(BaseModel):
+    property_id: str
+    starting_bid: int = 1
+    duration_seconds: Optional[float] = None
+
+class PlaceBidRequest(BaseModel):
+    player_id: int
+    amount: int
+
+class TradeSide(BaseModel):
+    player_id: int
+    cash: int = 0
+    property_ids: List[str] = []
+    # Mortgaged properties this side receives and unmortgages straight away (110% of the
+    # mortgage value) instead of paying the 10% interest and keeping them mortgaged
+    unmortgage_property_ids: List[str] = []
+
+class TradeRequest(BaseModel):
+    proposer: TradeSide
+    counterparty: TradeSide
+
+class RespondToTradeRequest(BaseModel):
+    player_id: int
+    unmortgage_property_ids: Optional[List[str]] = None
+
+class LiquidationRequest(BaseModel):
+    player_id: int
+    amount_owed: int
+
+class CreateDebtRequest(BaseModel):
+    from_player_id: Optional[int] = None
+    to_player_id: Optional[int] = None
+    amount: int
+    description: str = ""
+
+class CreateScheduledPaymentRequest(BaseModel):
+    from_player_id: Optional[int] = None
+    to_player_id: Optional[int] = None
+    is_fine: bool = False
+    amount: int
+    description: str = ""
+    unit: str = "turn"
+    every: int = 1
+    # Turns or rounds until the first payment; defaults to `every`
+    start_in: Optional[int] = None
+    # Stop after this many payments; repeats until cancelled when omitted
+    occurrences: Optional[int] = None
+
+class CreateLoanRequest(BaseModel):
+    lender_id: Optional[int] = None
+    borrower_id: int
+    principal: int
+    rate: float = 0
+    due_in_turns: int
+    description: str = ""
+
+class RepayLoanRequest(BaseModel):
+    # Repays everything owed when omitted
+    amount: Optional[int] = None
+
+class RollRequest(BaseModel):
+    player_id: int
+    # Physical dice can be entered instead of letting the server roll
+    dice: Optional[List[int]] = None
+    advance_turn: bool = False
+
+class CreateTournamentRequest(BaseModel):
+    name: str
+
+class CreateTableRequest(BaseModel):
+    name: str
+
+class PlayerStanding(BaseModel):
+    player_id: int
+    name: str
+    cash: int
+    net_worth: int
+
+class TableStandingsReport(BaseModel):
+    players: List[PlayerStanding]
+
+class BuildPlanRequest(BaseModel):
+    player_id: int
+    budget: Optional[int] = None
+    apply: bool = False
+
 @app.get("/healthz")
 async def healthz():
     return {"status": "ok"}
 
+@app.get("/admission/stats")
+async def get_admission_stats():
+    return {
+        **admission_controller.stats(),
+        "idempotency_keys": len(idempotency_cache.entries),
+        "idempotent_replays": idempotency_cache.hits,
+    }
+
+@app.get("/profiling/stats")
+async def get_profiling_stats():
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    return request_profiler.stats()
+
+@app.get("/profiling/slow-requests")
+async def get_slow_requests():
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    return {"slow_threshold_ms": request_profiler.slow_threshold_ms, "requests": list(request_profiler.slow_requests)}
+
+@app.get("/profiling/profile")
+async def get_profile(seconds: float = 5, interval_ms: float = 5):
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if seconds <= 0 or seconds > PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"Seconds must be between 0 and {PROFILE_MAX_SECONDS}")
+    if interval_ms < 1:
+        raise HTTPException(status_code=400, detail="Sampling interval must be at least 1ms")
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already being captured")
+    async with profile_lock:
+        stacks = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+    lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+    return PlainTextResponse("\n".join(lines) + "\n")
+
+class UploadedSnapshot(BaseModel):
+    # The parts of a game_state.json that the diff reads; anything else is only compared
+    # for equality, so it is kept as is
+    model_config = ConfigDict(extra="allow")
+
+    players: dict[str, Player] = {}
+    owned_properties: dict[str, OwnedProperty] = {}
+    property_owners: dict[str, int] = {}
+    free_parking_pot: int = 0
+
+class CompareSnapshotsRequest(BaseModel):
+    before: UploadedSnapshot
+    after: UploadedSnapshot
+
+@app.get("/game/diff")
+async def diff_game_states(from_transaction: int, to_transaction: Optional[int] = None):
+    latest = game_state.next_transaction_id - 1
+    to_id = latest if to_transaction is None else to_transaction
+    if not 0 <= from_transaction <= latest or not 0 <= to_id <= latest:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    if from_transaction > to_id:
+        raise HTTPException(status_code=400, detail="from_transaction must not be after to_transaction")
+    snapshots = state_history.snapshots_between(from_transaction, to_id)
+    if snapshots is None:
+        raise HTTPException(status_code=404, detail="No history recorded for that transaction")
+    transactions = game_state.transactions
+    start = bisect.bisect_right(transactions, from_transaction, key=lambda t: t.id)
+    end = bisect.bisect_right(transactions, to_id, key=lambda t: t.id)
+    return FastJSONResponse({
+        "from_transaction": from_transaction,
+        "to_transaction": to_id,
+        **compare_snapshots(*snapshots),
+        "transactions": [t.model_dump() for t in transactions[start:end]],
+    })
+
+@app.post("/game/diff")
+async def diff_snapshots_endpoint(request: CompareSnapshotsRequest):
+    # Compares two uploaded game_state.json files
+    return compare_snapshots(request.before.model_dump(), request.after.model_dump())
+
 @app.get("/game/versions")
 async def get_game_versions():
     return {"versions": GAME_VERSIONS, "current_version": game_state.version}
@@ -509,17 +1419,16 @@ async def set_game_version(request: SetVersionRequest):
     save_game_state()
     return {"message": f"Game version set to {request.version}", "version": request.version}
 
-@app.get("/game/state")
-async def get_game_state():
+def game_state_view(state: GameState) -> dict:
+    board = board_for(state.version)
     players_list = []
-    for player in game_state.players.values():
+    for player in state.players.values():
         player_properties = []
-        for prop_id, owner_id in game_state.property_owners.items():
+        for prop_id, owner_id in state.property_owners.items():
             if owner_id == player.id:
-                owned_prop = game_state.owned_properties.get(prop_id)
-                prop_data = PROPERTIES_DATA[prop_id].copy()
+                owned_prop = state.owned_properties.get(prop_id)
+                prop_data = board.json_properties[prop_id].copy()
                 prop_data["property_id"] = prop_id
-                prop_data["name"] = get_display_name(prop_id)
                 if owned_prop:
                     prop_data["houses"] = owned_prop.houses
                     prop_data["has_hotel"] = owned_prop.has_hotel
@@ -534,31 +1443,50 @@ async def get_game_state():
     
     available_props = []
     for prop_id in PROPERTIES_DATA:
-        if prop_id not in game_state.property_owners:
-            prop_data = PROPERTIES_DATA[prop_id].copy()
+        if prop_id not in state.property_owners:
+            prop_data = board.json_properties[prop_id].copy()
             prop_data["property_id"] = prop_id
-            prop_data["name"] = get_display_name(prop_id)
             available_props.append(prop_data)
     
     return {
         "players": players_list,
-        "free_parking_pot": game_state.free_parking_pot,
+        "free_parking_pot": state.free_parking_pot,
         "available_properties": available_props,
-        "version": game_state.version,
+        "version": state.version,
         "versions": GAME_VERSIONS,
-        "turn_order": game_state.turn_order,
-        "current_turn_index": game_state.current_turn_index
+        "turn_order": state.turn_order,
+        "current_turn_index": state.current_turn_index,
+        "bank_houses": state.bank_houses,
+        "bank_hotels": state.bank_hotels,
+        "positions": state.positions
     }
 
+@app.get("/game/revision")
+async def get_game_revision():
+    # Cheap enough to poll; clients refetch /game/state when it changes
+    return {"revision": state_revision()}
+
+@app.get("/game/state")
+async def get_game_state(at: Optional[int] = None):
+    if at is None:
+        return FastJSONResponse({**game_state_view(game_state), "revision": state_revision()})
+    if at < 0 or at >= game_state.next_transaction_id:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    snapshot = state_history.snapshot_at(at)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="No history recorded for that transaction")
+    past_state = GameState()
+    apply_snapshot(past_state, snapshot)
+    return FastJSONResponse({**game_state_view(past_state), "at_transaction_id": at})
+
 @app.get("/properties")
 async def get_all_properties():
     props = []
-    for prop_id, data in PROPERTIES_DATA.items():
+    for prop_id, data in board_for(game_state.version).json_properties.items():
         prop_data = data.copy()
         prop_data["property_id"] = prop_id
-        prop_data["name"] = get_display_name(prop_id)
         props.append(prop_data)
-    return {"properties": props}
+    return FastJSONResponse({"properties": props})
 
 @app.post("/players")
 async def create_player(request: CreatePlayerRequest):
@@ -580,12 +1508,17 @@ async def create_player(request: CreatePlayerRequest):
 async def remove_player(player_id: int):
     if player_id not in game_state.players:
         raise HTTPException(status_code=404, detail="Player not found")
+    # Dropping the player would silently write their loans off, or the money lent out by them
+    if any(player_id in (l.lender_id, l.borrower_id) for l in game_state.loans.values()):
+        raise HTTPException(status_code=400, detail="Player has outstanding loans. Repay them first.")
     
     props_to_remove = [prop_id for prop_id, owner_id in game_state.property_owners.items() if owner_id == player_id]
     for prop_id in props_to_remove:
         del game_state.property_owners[prop_id]
         if prop_id in game_state.owned_properties:
-            del game_state.owned_properties[prop_id]
+            owned_prop = game_state.owned_properties.pop(prop_id)
+            game_state.bank_houses += owned_prop.houses
+            game_state.bank_hotels += 1 if owned_prop.has_hotel else 0
     
     if player_id in game_state.turn_order:
         removed_index = game_state.turn_order.index(player_id)
@@ -595,6 +1528,11 @@ async def remove_player(player_id: int):
         elif removed_index < game_state.current_turn_index:
             game_state.current_turn_index -= 1
     
+    game_state.debts = [d for d in game_state.debts if player_id not in (d.from_player_id, d.to_player_id)]
+    game_state.positions.pop(player_id, None)
+    game_state.scheduled_payments = {
+        k: p for k, p in game_state.scheduled_payments.items() if player_id not in (p.from_player_id, p.to_player_id)
+    }
     del game_state.players[player_id]
     save_game_state()
     return {"message": "Player removed"}
@@ -635,6 +1573,8 @@ async def buy_property(request: BuyPropertyRequest):
         raise HTTPException(status_code=404, detail="Property not found")
     if request.property_id in game_state.property_owners:
         raise HTTPException(status_code=400, detail="Property already owned")
+    if request.property_id in open_auctions_by_property:
+        raise HTTPException(status_code=400, detail="Property is being auctioned")
     
     player = game_state.players[request.player_id]
     prop_data = PROPERTIES_DATA[request.property_id]
@@ -648,7 +1588,7 @@ async def buy_property(request: BuyPropertyRequest):
     
     prop_name = get_display_name(request.property_id)
     player_name = get_player_name(request.player_id)
-    add_transaction("purchase", player_name, "Bank", prop_data["purchase_cost"], f"{player_name} bought {prop_name} for £{prop_data['purchase_cost']}")
+    add_transaction("purchase", player_name, "Bank", prop_data["purchase_cost"], f"{player_name} bought {prop_name} for £{prop_data['purchase_cost']}", request.property_id)
     
     save_game_state()
     
@@ -734,16 +1674,23 @@ async def build_house(request: BuildHouseRequest):
     
     if player.cash < house_cost:
         raise HTTPException(status_code=400, detail="Insufficient funds")
+    if owned_prop.houses == 4 and game_state.bank_hotels < 1:
+        raise HTTPException(status_code=400, detail="The bank has no hotels left")
+    if owned_prop.houses < 4 and game_state.bank_houses < 1:
+        raise HTTPException(status_code=400, detail="The bank has no houses left")
     
     player.cash -= house_cost
     
     if owned_prop.houses == 4:
         owned_prop.houses = 0
         owned_prop.has_hotel = True
+        game_state.bank_hotels -= 1
+        game_state.bank_houses += 4
         save_game_state()
         return {"message": f"Hotel built on {get_display_name(request.property_id)}", "player_cash": player.cash}
     else:
         owned_prop.houses += 1
+        game_state.bank_houses -= 1
         save_game_state()
         return {"message": f"House built on {get_display_name(request.property_id)} (now {owned_prop.houses} houses)", "player_cash": player.cash}
 
@@ -766,13 +1713,18 @@ async def sell_building(request: BuildHouseRequest):
     sell_value = prop_data["house_cost"] // 2
     
     if owned_prop.has_hotel:
+        if game_state.bank_houses < 4:
+            raise HTTPException(status_code=400, detail="The bank does not have 4 houses to replace the hotel")
         owned_prop.has_hotel = False
         owned_prop.houses = 4
+        game_state.bank_hotels += 1
+        game_state.bank_houses -= 4
         player.cash += sell_value
         save_game_state()
         return {"message": f"Hotel sold on {get_display_name(request.property_id)} (now 4 houses)", "player_cash": player.cash}
     else:
         owned_prop.houses -= 1
+        game_state.bank_houses += 1
         player.cash += sell_value
         save_game_state()
         return {"message": f"House sold on {get_display_name(request.property_id)} (now {owned_prop.houses} houses)", "player_cash": player.cash}
@@ -859,7 +1811,7 @@ def calculate_rent(property_id: str, dice_roll: Optional[int] = None) -> int:
     
     if prop_data["type"] == PropertyType.STATION:
         stations_owned = sum(
-            1 for pid in ["kings_cross_station", "marylebone_station", "fenchurch_street_station", "liverpool_street_station"]
+            1 for pid in BASE_BOARD.groups[PropertyColor.STATION]
             if game_state.property_owners.get(pid) == owner_id
         )
         return STATION_RENT.get(stations_owned, 0)
@@ -868,7 +1820,7 @@ def calculate_rent(property_id: str, dice_roll: Optional[int] = None) -> int:
         if dice_roll is None:
             raise ValueError("Dice roll required for utility rent")
         utilities_owned = sum(
-            1 for pid in ["electric_company", "water_works"]
+            1 for pid in BASE_BOARD.groups[PropertyColor.UTILITY]
             if game_state.property_owners.get(pid) == owner_id
         )
         multiplier = 10 if utilities_owned == 2 else 4
@@ -940,7 +1892,7 @@ async def pay_rent(request: PayRentRequest):
     payer_name = get_player_name(request.from_player_id)
     owner_name = get_player_name(owner_id)
     prop_name = get_display_name(request.property_id)
-    add_transaction("rent", payer_name, owner_name, rent, f"{payer_name} paid £{rent} rent to {owner_name} for {prop_name}")
+    add_transaction("rent", payer_name, owner_name, rent, f"{payer_name} paid £{rent} rent to {owner_name} for {prop_name}", request.property_id)
     
     save_game_state()
     
@@ -1070,9 +2022,11 @@ async def sell_all_buildings(request: SellAllBuildingsRequest):
                 buildings_sold += 5
                 owned_prop.has_hotel = False
                 owned_prop.houses = 0
+                game_state.bank_hotels += 1
             else:
                 total_value += sell_value * owned_prop.houses
                 buildings_sold += owned_prop.houses
+                game_state.bank_houses += owned_prop.houses
                 owned_prop.houses = 0
     
     player.cash += total_value
@@ -1148,9 +2102,11 @@ async def cash_out(request: CashOutRequest):
                 buildings_sold += 5
                 owned_prop.has_hotel = False
                 owned_prop.houses = 0
+                game_state.bank_hotels += 1
             else:
                 total_value += sell_value * owned_prop.houses
                 buildings_sold += owned_prop.houses
+                game_state.bank_houses += owned_prop.houses
                 owned_prop.houses = 0
     
     # Then sell all properties
@@ -1169,6 +2125,7 @@ async def cash_out(request: CashOutRequest):
     
     player.cash += total_value
     add_transaction("sale", player.name, "Bank", total_value, f"{player.name} cashed out: sold {buildings_sold} buildings and {properties_sold} properties for £{total_value}")
+    loan_repayments = settle_loans(player)
     save_game_state()
     
     return {
@@ -1176,6 +2133,7 @@ async def cash_out(request: CashOutRequest):
         "buildings_sold": buildings_sold,
         "properties_sold": properties_sold,
         "total_value": total_value,
+        "loan_repayments": loan_repayments,
         "player_cash": player.cash
     }
 
@@ -1183,13 +2141,14 @@ async def cash_out(request: CashOutRequest):
 async def next_turn():
     if len(game_state.turn_order) == 0:
         raise HTTPException(status_code=400, detail="No players in turn order")
-    game_state.current_turn_index = (game_state.current_turn_index + 1) % len(game_state.turn_order)
+    payments = advance_turn()
     save_game_state()
     current_player_id = game_state.turn_order[game_state.current_turn_index]
     return {
         "current_turn_index": game_state.current_turn_index,
         "current_player_id": current_player_id,
-        "current_player_name": get_player_name(current_player_id)
+        "current_player_name": get_player_name(current_player_id),
+        "scheduled_payments": payments,
     }
 
 @app.post("/turn/reorder")
@@ -1207,6 +2166,9 @@ async def reorder_players(request: ReorderPlayersRequest):
 
 @app.post("/game/reset")
 async def reset_game():
+    cancel_all_auctions()
+    trade_proposals.clear()
+    state_history.clear()
     game_state.players.clear()
     game_state.owned_properties.clear()
     game_state.property_owners.clear()
@@ -1214,21 +2176,1502 @@ async def reset_game():
     game_state.next_player_id = 1
     game_state.version = "london"
     game_state.transactions.clear()
+    transaction_index.clear()
     game_state.next_transaction_id = 1
     game_state.turn_order.clear()
     game_state.current_turn_index = 0
+    game_state.bank_houses = BANK_HOUSES
+    game_state.bank_hotels = BANK_HOTELS
+    game_state.debts.clear()
+    game_state.next_debt_id = 1
+    game_state.positions.clear()
+    game_state.turn_count = 0
+    game_state.round_count = 0
+    game_state.scheduled_payments.clear()
+    game_state.next_scheduled_payment_id = 1
+    game_state.rebuild_payment_queues()
+    game_state.loans.clear()
+    game_state.next_loan_id = 1
     save_game_state()
     return {"message": "Game reset"}
 
+TRANSACTION_PAGE_MAX = 500
+
 @app.get("/transactions")
-async def get_transactions():
-    return {"transactions": [t.model_dump() for t in game_state.transactions]}
+async def get_transactions(before: Optional[int] = None, after: Optional[int] = None,
+                           log_id: Optional[str] = None, limit: Optional[int] = None):
+    # Without a limit the whole log is returned; with one, the newest `limit` transactions older
+    # than the `before` cursor, plus the cursor for the page before them (null on the first page).
+    # `after` instead returns the oldest `limit` transactions newer than that id, for a client
+    # catching up; if the log it read from (`log_id`) has since been reset it gets the newest
+    # page again with `replaced: true`.
+    if limit is None and before is None and after is None:
+        return FastJSONResponse({"transactions": [t.model_dump() for t in game_state.transactions]})
+    if before is not None and after is not None:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
+    limit = TRANSACTION_PAGE_MAX if limit is None else limit
+    if limit < 1 or limit > TRANSACTION_PAGE_MAX:
+        raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {TRANSACTION_PAGE_MAX}")
+    transactions = game_state.transactions
+    current_log_id = transaction_log_id()
+    if after is not None and (log_id is None or log_id == current_log_id):
+        # Transactions are appended in id order, so the cursor position can be found by bisection
+        start = bisect.bisect_right(transactions, after, key=lambda t: t.id)
+        end = min(len(transactions), start + limit)
+        return FastJSONResponse({
+            "transactions": [t.model_dump() for t in transactions[start:end]],
+            "has_more": end < len(transactions),
+            "replaced": False,
+            "log_id": current_log_id,
+        })
+    end = len(transactions) if before is None else bisect.bisect_left(transactions, before, key=lambda t: t.id)
+    start = max(0, end - limit)
+    return FastJSONResponse({
+        "transactions": [t.model_dump() for t in transactions[start:end]],
+        "next_cursor": transactions[start].id if start > 0 else None,
+        "replaced": after is not None,
+        "log_id": current_log_id,
+    })
+
+def parse_search_time(value: Optional[str], name: str) -> Optional[str]:
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO 8601 timestamp")
+
+@app.get("/transactions/search")
+async def search_transactions(type: Optional[str] = None, from_entity: Optional[str] = None,
+                              to_entity: Optional[str] = None, entity: Optional[str] = None,
+                              property_id: Optional[str] = None, min_amount: Optional[int] = None,
+                              max_amount: Optional[int] = None, since: Optional[str] = None,
+                              until: Optional[str] = None, q: Optional[str] = None,
+                              before: Optional[int] = None, limit: int = 100):
+    # Filters combine with AND, as do the words of q; results page like /transactions
+    if limit < 1 or limit > TRANSACTION_PAGE_MAX:
+        raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {TRANSACTION_PAGE_MAX}")
+    matches = transaction_index.search(
+        type=type, from_entity=from_entity, to_entity=to_entity, entity=entity, property_id=property_id,
+        min_amount=min_amount, max_amount=max_amount, since=parse_search_time(since, "since"),
+        until=parse_search_time(until, "until"), text=q,
+    )
+    transactions = game_state.transactions
+    end = len(matches) if before is None else bisect.bisect_left(matches, before, key=lambda pos: transactions[pos].id)
+    start = max(0, end - limit)
+    return FastJSONResponse({
+        "transactions": [transactions[pos].model_dump() for pos in matches[start:end]],
+        "total": len(matches),
+        "next_cursor": transactions[matches[start]].id if start > 0 else None,
+    })
+
+AUCTION_DEFAULT_SECONDS = float(os.environ.get("AUCTION_DEFAULT_SECONDS", "30"))
+AUCTION_MIN_SECONDS = 5
+AUCTION_MAX_SECONDS = 300
+# Finished auctions stay listed this long so every player sees the result, then are dropped
+AUCTION_RETENTION_SECONDS = float(os.environ.get("AUCTION_RETENTION_SECONDS", "600"))
+
+class Bid(BaseModel):
+    player_id: int
+    amount: int
+    timestamp: str
+
+class Auction:
+    def __init__(self, auction_id: int, property_id: str, starting_bid: int, duration: float):
+        self.id = auction_id
+        self.property_id = property_id
+        self.starting_bid = starting_bid
+        self.closes_at = time.time() + duration
+        self.status = "open"
+        self.bids: list[Bid] = []
+        self.winner_id: Optional[int] = None
+        self.winning_bid: Optional[int] = None
+        self.closed_at: Optional[float] = None
+        # Serializes bids against each other and against the closing timer, per auction,
+        # so auctions on different properties never wait on one another
+        self.lock = asyncio.Lock()
+        self.timer: Optional[asyncio.Task] = None
+
+    @property
+    def high_bid(self) -> Optional[Bid]:
+        return self.bids[-1] if self.bids else None
+
+    def to_dict(self) -> dict:
+        high_bid = self.high_bid
+        return {
+            "id": self.id,
+            "property_id": self.property_id,
+            "property_name": get_display_name(self.property_id),
+            "status": self.status,
+            "starting_bid": self.starting_bid,
+            "closes_at": datetime.fromtimestamp(self.closes_at).isoformat(),
+            "seconds_remaining": max(0.0, round(self.closes_at - time.time(), 1)) if self.status == "open" else 0.0,
+            "high_bid": high_bid.amount if high_bid else None,
+            "high_bidder_id": high_bid.player_id if high_bid else None,
+            "bids": [b.model_dump() for b in self.bids],
+            "winner_id": self.winner_id,
+            "winning_bid": self.winning_bid,
+        }
+
+auctions: dict[int, Auction] = {}
+open_auctions_by_property: dict[str, int] = {}
+next_auction_id = 1
+
+async def run_auction_timer(auction: Auction):
+    await asyncio.sleep(max(0.0, auction.closes_at - time.time()))
+    await close_auction(auction)
+
+async def close_auction(auction: Auction):
+    async with auction.lock:
+        if auction.status != "open":
+            return
+        open_auctions_by_property.pop(auction.property_id, None)
+        auction.status = "unsold"
+        auction.closed_at = time.time()
+        if auction.property_id in game_state.property_owners:
+            return
+        # Cash may have moved since a bid was placed; the highest bid still covered wins
+        for bid in reversed(auction.bids):
+            player = game_state.players.get(bid.player_id)
+            if player is None or player.cash < bid.amount:
+                continue
+            player.cash -= bid.amount
+            game_state.property_owners[auction.property_id] = player.id
+            game_state.owned_properties[auction.property_id] = OwnedProperty(property_id=auction.property_id)
+            auction.status = "sold"
+            auction.winner_id = player.id
+            auction.winning_bid = bid.amount
+            prop_name = get_display_name(auction.property_id)
+            add_transaction("auction", player.name, "Bank", bid.amount, f"{player.name} won {prop_name} at auction for £{bid.amount}", auction.property_id)
+            save_game_state()
+            break
+
+def prune_auctions():
+    cutoff = time.time() - AUCTION_RETENTION_SECONDS
+    for auction_id in [a.id for a in auctions.values() if a.closed_at is not None and a.closed_at < cutoff]:
+        del auctions[auction_id]
+
+def cancel_all_auctions():
+    for auction in auctions.values():
+        if auction.timer is not None:
+            auction.timer.cancel()
+    auctions.clear()
+    open_auctions_by_property.clear()
+
+def get_auction_or_404(auction_id: int) -> Auction:
+    prune_auctions()
+    if auction_id not in auctions:
+        raise HTTPException(status_code=404, detail="Auction not found")
+    return auctions[auction_id]
+
+@app.post("/auctions")
+async def open_auction(request: OpenAuctionRequest):
+    global next_auction_id
+    if request.property_id not in PROPERTIES_DATA:
+        raise HTTPException(status_code=404, detail="Property not found")
+    if request.property_id in game_state.property_owners:
+        raise HTTPException(status_code=400, detail="Property already owned")
+    if request.property_id in open_auctions_by_property:
+        raise HTTPException(status_code=400, detail="Property is already being auctioned")
+    if request.starting_bid < 1:
+        raise HTTPException(status_code=400, detail="Starting bid must be at least £1")
+    
+    duration = request.duration_seconds if request.duration_seconds is not None else AUCTION_DEFAULT_SECONDS
+    if not AUCTION_MIN_SECONDS <= duration <= AUCTION_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"Duration must be between {AUCTION_MIN_SECONDS} and {AUCTION_MAX_SECONDS} seconds")
+    
+    prune_auctions()
+    auction = Auction(next_auction_id, request.property_id, request.starting_bid, duration)
+    next_auction_id += 1
+    auctions[auction.id] = auction
+    open_auctions_by_property[auction.property_id] = auction.id
+    auction.timer = asyncio.create_task(run_auction_timer(auction))
+    return {"auction": auction.to_dict()}
+
+@app.get("/auctions")
+async def list_auctions():
+    prune_auctions()
+    return {"auctions": [a.to_dict() for a in auctions.values()]}
+
+@app.get("/auctions/{auction_id}")
+async def get_auction(auction_id: int):
+    return {"auction": get_auction_or_404(auction_id).to_dict()}
+
+@app.post("/auctions/{auction_id}/bid")
+async def place_bid(auction_id: int, request: PlaceBidRequest):
+    auction = get_auction_or_404(auction_id)
+    if request.player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="Player not found")
+    
+    async with auction.lock:
+        if auction.status != "open" or time.time() >= auction.closes_at:
+            raise HTTPException(status_code=400, detail="Auction is closed")
+        high_bid = auction.high_bid
+        minimum = high_bid.amount + 1 if high_bid else auction.starting_bid
+        if request.amount < minimum:
+            raise HTTPException(status_code=400, detail=f"Bid must be at least £{minimum}")
+        if game_state.players[request.player_id].cash < request.amount:
+            raise HTTPException(status_code=400, detail="Insufficient funds")
+        auction.bids.append(Bid(player_id=request.player_id, amount=request.amount, timestamp=datetime.now().isoformat()))
+    
+    return {"auction": auction.to_dict()}
+
+@app.post("/auctions/{auction_id}/close")
+async def close_auction_now(auction_id: int):
+    auction = get_auction_or_404(auction_id)
+    if auction.status != "open":
+        raise HTTPException(status_code=400, detail="Auction is closed")
+    if auction.timer is not None:
+        auction.timer.cancel()
+    await close_auction(auction)
+    return {"auction": auction.to_dict()}
+
+def plan_trade(trade: TradeRequest) -> dict:
+    a, b = trade.proposer, trade.counterparty
+    if a.player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="Proposer not found")
+    if b.player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="Counterparty not found")
+    if a.player_id == b.player_id:
+        raise HTTPException(status_code=400, detail="Cannot trade with yourself")
+    if a.cash < 0 or b.cash < 0:
+        raise HTTPException(status_code=400, detail="Cash amounts must not be negative")
+    if not (a.cash or b.cash or a.property_ids or b.property_ids):
+        raise HTTPException(status_code=400, detail="Trade is empty")
+    all_props = a.property_ids + b.property_ids
+    if len(set(all_props)) != len(all_props):
+        raise HTTPException(status_code=400, detail="A property appears more than once in the trade")
+    
+    net_cash = {a.player_id: b.cash - a.cash, b.player_id: a.cash - b.cash}
+    mortgage_fees = {a.player_id: 0, b.player_id: 0}
+    unmortgaged: list[str] = []
+    for giver, receiver in ((a, b), (b, a)):
+        for prop_id in giver.property_ids:
+            if prop_id not in PROPERTIES_DATA:
+                raise HTTPException(status_code=404, detail=f"Property {prop_id} not found")
+            if game_state.property_owners.get(prop_id) != giver.player_id:
+                raise HTTPException(status_code=400, detail=f"{get_player_name(giver.player_id)} does not own {get_display_name(prop_id)}")
+            owned_prop = game_state.owned_properties[prop_id]
+            if owned_prop.houses > 0 or owned_prop.has_hotel:
+                raise HTTPException(status_code=400, detail=f"Must sell all buildings on {get_display_name(prop_id)} before trading it")
+        for prop_id in receiver.unmortgage_property_ids:
+            if prop_id not in giver.property_ids or not game_state.owned_properties[prop_id].is_mortgaged:
+                raise HTTPException(status_code=400, detail=f"{prop_id} is not a mortgaged property received in this trade")
+        for prop_id in giver.property_ids:
+            if not game_state.owned_properties[prop_id].is_mortgaged:
+                continue
+            mortgage_value = PROPERTIES_DATA[prop_id]["mortgage_value"]
+            if prop_id in receiver.unmortgage_property_ids:
+                mortgage_fees[receiver.player_id] += int(mortgage_value * 1.1)
+                unmortgaged.append(prop_id)
+            else:
+                mortgage_fees[receiver.player_id] += int(mortgage_value * 0.1)
+    
+    final_cash = {}
+    for player_id in (a.player_id, b.player_id):
+        final_cash[player_id] = game_state.players[player_id].cash + net_cash[player_id] - mortgage_fees[player_id]
+        if final_cash[player_id] < 0:
+            raise HTTPException(status_code=400, detail=f"{get_player_name(player_id)} has insufficient funds for this trade")
+    
+    return {"final_cash": final_cash, "mortgage_fees": mortgage_fees, "unmortgaged": unmortgaged}
+
+def describe_trade_side(side: TradeSide) -> str:
+    items = [get_display_name(pid) for pid in side.property_ids]
+    if side.cash:
+        items.append(f"£{side.cash}")
+    return ", ".join(items) if items else "nothing"
+
+def execute_trade(trade: TradeRequest) -> dict:
+    plan = plan_trade(trade)
+    a, b = trade.proposer, trade.counterparty
+    for player_id, cash in plan["final_cash"].items():
+        game_state.players[player_id].cash = cash
+    for giver, receiver in ((a, b), (b, a)):
+        for prop_id in giver.property_ids:
+            game_state.property_owners[prop_id] = receiver.player_id
+    for prop_id in plan["unmortgaged"]:
+        game_state.owned_properties[prop_id].is_mortgaged = False
+    
+    a_name = get_player_name(a.player_id)
+    b_name = get_player_name(b.player_id)
+    description = f"{a_name} traded {describe_trade_side(a)} to {b_name} for {describe_trade_side(b)}"
+    fees = [f"{get_player_name(pid)} paid £{fee} mortgage interest/unmortgage costs" for pid, fee in plan["mortgage_fees"].items() if fee]
+    if fees:
+        description += " (" + "; ".join(fees) + ")"
+    add_transaction("trade", a_name, b_name, abs(a.cash - b.cash), description)
+    save_game_state()
+    
+    return {
+        "message": description,
+        "player_cash": {pid: game_state.players[pid].cash for pid in plan["final_cash"]},
+        "mortgage_fees": plan["mortgage_fees"],
+    }
+
+trade_proposals: dict[int, dict] = {}
+next_trade_id = 1
+
+def get_trade_or_404(trade_id: int) -> dict:
+    if trade_id not in trade_proposals:
+        raise HTTPException(status_code=404, detail="Trade not found")
+    return trade_proposals[trade_id]
+
+@app.post("/trades")
+async def trade(request: TradeRequest):
+    return execute_trade(request)
+
+@app.post("/trades/propose")
+async def propose_trade(request: TradeRequest):
+    global next_trade_id
+    plan_trade(request)
+    proposal = {"id": next_trade_id, "status": "pending", "created": datetime.now().isoformat(), "trade": request}
+    trade_proposals[proposal["id"]] = proposal
+    next_trade_id += 1
+    return {"trade": {**proposal, "trade": request.model_dump()}}
+
+@app.get("/trades")
+async def list_trades():
+    return {"trades": [{**p, "trade": p["trade"].model_dump()} for p in trade_proposals.values()]}
+
+@app.post("/trades/{trade_id}/accept")
+async def accept_trade(trade_id: int, request: RespondToTradeRequest):
+    proposal = get_trade_or_404(trade_id)
+    if proposal["status"] != "pending":
+        raise HTTPException(status_code=400, detail=f"Trade is {proposal['status']}")
+    trade_request: TradeRequest = proposal["trade"]
+    if request.player_id != trade_request.counterparty.player_id:
+        raise HTTPException(status_code=400, detail="Only the counterparty can accept this trade")
+    if request.unmortgage_property_ids is not None:
+        trade_request = trade_request.model_copy(update={
+            "counterparty": trade_request.counterparty.model_copy(update={"unmortgage_property_ids": request.unmortgage_property_ids})
+        })
+    # Re-validated against current state: holdings and cash may have changed since the proposal
+    result = execute_trade(trade_request)
+    proposal["status"] = "accepted"
+    proposal["trade"] = trade_request
+    return result
+
+@app.post("/trades/{trade_id}/decline")
+async def decline_trade(trade_id: int, request: RespondToTradeRequest):
+    proposal = get_trade_or_404(trade_id)
+    if proposal["status"] != "pending":
+        raise HTTPException(status_code=400, detail=f"Trade is {proposal['status']}")
+    trade_request: TradeRequest = proposal["trade"]
+    if request.player_id == trade_request.counterparty.player_id:
+        proposal["status"] = "declined"
+    elif request.player_id == trade_request.proposer.player_id:
+        proposal["status"] = "withdrawn"
+    else:
+        raise HTTPException(status_code=400, detail="Player is not part of this trade")
+    return {"trade": {**proposal, "trade": trade_request.model_dump()}}
+
+def building_level(owned_prop: OwnedProperty) -> int:
+    return 5 if owned_prop.has_hotel else owned_prop.houses
+
+def even_sell_order(prop_ids: list[str]) -> list[str]:
+    # One entry per building sale, always taking from the most developed property in the group
+    levels = {pid: building_level(game_state.owned_properties[pid]) for pid in prop_ids}
+    order = []
+    while prop_ids:
+        prop_id = max(prop_ids, key=lambda pid: levels[pid])
+        if levels[prop_id] == 0:
+            break
+        order.append(prop_id)
+        levels[prop_id] = 4 if levels[prop_id] == 5 else levels[prop_id] - 1
+    return order
+
+def liquidation_options(prop_ids: list[str]) -> list[dict]:
+    # Every way of liquidating one group: sell the first n buildings in even-sell order, then
+    # mortgage or sell any property whose buildings are gone by then
+    sales = even_sell_order(prop_ids)
+    cleared_after = {pid: 0 for pid in prop_ids}
+    for i, prop_id in enumerate(sales):
+        cleared_after[prop_id] = i + 1
+    
+    options = []
+    for steps in range(len(sales) + 1):
+        building_cash = sum(PROPERTIES_DATA[pid]["house_cost"] // 2 for pid in sales[:steps])
+        choices = []
+        for prop_id in prop_ids:
+            prop_choices = [None]
+            if cleared_after[prop_id] <= steps:
+                if not game_state.owned_properties[prop_id].is_mortgaged:
+                    prop_choices.append("mortgage")
+                prop_choices.append("sell")
+            choices.append(prop_choices)
+        for combo in itertools.product(*choices):
+            cash = building_cash
+            mortgaged, sold = [], []
+            for prop_id, choice in zip(prop_ids, combo):
+                prop_data = PROPERTIES_DATA[prop_id]
+                if choice == "mortgage":
+                    cash += prop_data["mortgage_value"]
+                    mortgaged.append(prop_id)
+                elif choice == "sell":
+                    cash += property_sale_value(prop_id)
+                    sold.append(prop_id)
+            options.append({
+                "cash": cash,
+                "cost": (len(sold), steps, len(mortgaged)),
+                "building_sales": sales[:steps],
+                "mortgage": mortgaged,
+                "sell": sold,
+            })
+    return options
+
+def property_sale_value(property_id: str) -> int:
+    prop_data = PROPERTIES_DATA[property_id]
+    owned_prop = game_state.owned_properties.get(property_id)
+    if owned_prop and owned_prop.is_mortgaged:
+        return prop_data["purchase_cost"] - prop_data["mortgage_value"]
+    return prop_data["purchase_cost"]
+
+def plan_liquidation(player_id: int, amount_owed: int) -> dict:
+    player = game_state.players[player_id]
+    needed = max(0, amount_owed - player.cash)
+    
+    groups: dict[PropertyColor, list[str]] = {}
+    for prop_id, owner_id in game_state.property_owners.items():
+        if owner_id == player_id:
+            groups.setdefault(PROPERTIES_DATA[prop_id]["color"], []).append(prop_id)
+    
+    # Knapsack over groups. Costs compare lexicographically: properties sold, then buildings
+    # sold, then mortgages taken. States are keyed by cash raised (capped at what is needed)
+    # and pruned to the Pareto front, which keeps the search small.
+    states = {0: ((0, 0, 0), 0, [])}
+    if needed > 0:
+        for prop_ids in groups.values():
+            options = liquidation_options(prop_ids)
+            expanded = {}
+            for cost, raised, picks in states.values():
+                for option in options:
+                    new_raised = raised + option["cash"]
+                    new_cost = tuple(a + b for a, b in zip(cost, option["cost"]))
+                    key = min(new_raised, needed)
+                    current = expanded.get(key)
+                    if current is None or (new_cost, new_raised) < (current[0], current[1]):
+                        expanded[key] = (new_cost, new_raised, picks + [option])
+            states = {}
+            best_cost = None
+            for key in sorted(expanded, reverse=True):
+                if best_cost is None or expanded[key][0] < best_cost:
+                    states[key] = expanded[key]
+                    best_cost = expanded[key][0]
+    
+    cost, raised, picks = states[max(states)]
+    actions = []
+    for option in picks:
+        for prop_id in option["building_sales"]:
+            actions.append({"action": "sell_building", "property_id": prop_id, "property_name": get_display_name(prop_id), "amount": PROPERTIES_DATA[prop_id]["house_cost"] // 2})
+    for option in picks:
+        for prop_id in option["mortgage"]:
+            actions.append({"action": "mortgage", "property_id": prop_id, "property_name": get_display_name(prop_id), "amount": PROPERTIES_DATA[prop_id]["mortgage_value"]})
+    for option in picks:
+        for prop_id in option["sell"]:
+            actions.append({"action": "sell_property", "property_id": prop_id, "property_name": get_display_name(prop_id), "amount": property_sale_value(prop_id)})
+    
+    return {
+        "player_id": player_id,
+        "amount_owed": amount_owed,
+        "player_cash": player.cash,
+        "cash_needed": needed,
+        "cash_raised": raised,
+        "sufficient": raised >= needed,
+        "shortfall": max(0, needed - raised),
+        "properties_sold": cost[0],
+        "buildings_sold": cost[1],
+        "properties_mortgaged": cost[2],
+        "actions": actions,
+    }
+
+@app.post("/liquidation/plan")
+async def preview_liquidation(request: LiquidationRequest):
+    if request.player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="Player not found")
+    if request.amount_owed < 0:
+        raise HTTPException(status_code=400, detail="Amount owed must not be negative")
+    return plan_liquidation(request.player_id, request.amount_owed)
+
+@app.post("/liquidation/execute")
+async def execute_liquidation(request: LiquidationRequest):
+    if request.player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="Player not found")
+    if request.amount_owed < 0:
+        raise HTTPException(status_code=400, detail="Amount owed must not be negative")
+    
+    plan = plan_liquidation(request.player_id, request.amount_owed)
+    if not plan["sufficient"]:
+        raise HTTPException(status_code=400, detail=f"Cannot raise enough: short by £{plan['shortfall']} after selling everything")
+    if not plan["actions"]:
+        return {**plan, "message": "No liquidation needed"}
+    
+    # Breaking up a hotel takes 4 houses from the bank; check the running supply up front
+    # so the plan is applied all-or-nothing
+    bank_houses = game_state.bank_houses
+    hotels_broken = set()
+    for action in plan["actions"]:
+        if action["action"] != "sell_building":
+            continue
+        if game_state.owned_properties[action["property_id"]].has_hotel and action["property_id"] not in hotels_broken:
+            hotels_broken.add(action["property_id"])
+            bank_houses -= 4
+            if bank_houses < 0:
+                raise HTTPException(status_code=400, detail="The bank does not have enough houses to break up hotels in this plan")
+        else:
+            bank_houses += 1
+    
+    player = game_state.players[request.player_id]
+    for action in plan["actions"]:
+        prop_id = action["property_id"]
+        owned_prop = game_state.owned_properties[prop_id]
+        if action["action"] == "sell_building":
+            if owned_prop.has_hotel:
+                owned_prop.has_hotel = False
+                owned_prop.houses = 4
+                game_state.bank_hotels += 1
+                game_state.bank_houses -= 4
+            else:
+                owned_prop.houses -= 1
+                game_state.bank_houses += 1
+        elif action["action"] == "mortgage":
+            owned_prop.is_mortgaged = True
+        else:
+            del game_state.property_owners[prop_id]
+            del game_state.owned_properties[prop_id]
+        player.cash += action["amount"]
+    
+    message = (f"{player.name} raised £{plan['cash_raised']}: sold {plan['buildings_sold']} buildings, "
+               f"mortgaged {plan['properties_mortgaged']} and sold {plan['properties_sold']} properties")
+    add_transaction("liquidation", player.name, "Bank", plan["cash_raised"], message)
+    save_game_state()
+    
+    return {**plan, "message": message, "player_cash": player.cash}
+
+# Rent at each building level (0-4 houses, 5 = hotel) for a property whose whole colour
+# group is owned, so level 0 is already the doubled base rent
+MONOPOLY_RENT_BY_LEVEL = {
+    prop_id: [data["rent"]["0"] * 2] + [data["rent"][str(n)] for n in range(1, 5)] + [data["rent"]["hotel"]]
+    for prop_id, data in PROPERTIES_DATA.items()
+    if data["type"] == PropertyType.PROPERTY
+}
+
+def buildable_groups(player_id: int) -> list[list[str]]:
+    return [
+        prop_ids for prop_ids in COLOR_GROUPS.values()
+        if all(game_state.property_owners.get(pid) == player_id for pid in prop_ids)
+        and not any(game_state.owned_properties[pid].is_mortgaged for pid in prop_ids)
+    ]
+
+def group_build_options(prop_ids: list[str]) -> list[dict]:
+    # Option n adds n buildings to the group. Even-build means the next building always goes on
+    # the least developed property; among those tied, the one whose rent rises most is chosen.
+    levels = {pid: building_level(game_state.owned_properties[pid]) for pid in prop_ids}
+    house_cost = PROPERTIES_DATA[prop_ids[0]]["house_cost"]
+    current_houses = sum(level for level in levels.values() if level < 5)
+    current_hotels = sum(1 for level in levels.values() if level == 5)
+    options = [{"buildings": 0, "cost": 0, "rent_gain": 0, "houses": 0, "peak_houses": 0, "hotels": 0,
+                "levels": dict(levels), "order": []}]
+    rent_gain = 0
+    # A hotel needs four houses on the lot first, so houses are drawn on the way up that only
+    # go back to the bank once the hotel replaces them; peak is the most out at any one time
+    drawn = peak = 0
+    order = []
+    while True:
+        candidates = [pid for pid in prop_ids if levels[pid] < 5]
+        if not candidates:
+            break
+        lowest = min(levels[pid] for pid in candidates)
+        prop_id = max(
+            (pid for pid in candidates if levels[pid] == lowest),
+            key=lambda pid: MONOPOLY_RENT_BY_LEVEL[pid][lowest + 1] - MONOPOLY_RENT_BY_LEVEL[pid][lowest],
+        )
+        rent_gain += MONOPOLY_RENT_BY_LEVEL[prop_id][lowest + 1] - MONOPOLY_RENT_BY_LEVEL[prop_id][lowest]
+        levels[prop_id] += 1
+        drawn += -4 if levels[prop_id] == 5 else 1
+        peak = max(peak, drawn)
+        order.append(prop_id)
+        buildings = len(options)
+        options.append({
+            "buildings": buildings,
+            "cost": buildings * house_cost,
+            "rent_gain": rent_gain,
+            # Net draw on the bank's supply; negative houses when houses are traded in for hotels
+            "houses": sum(level for level in levels.values() if level < 5) - current_houses,
+            "peak_houses": peak,
+            "hotels": sum(1 for level in levels.values() if level == 5) - current_hotels,
+            "levels": dict(levels),
+            "order": list(order),
+        })
+    return options
+
+def plan_builds(player_id: int, budget: int) -> dict:
+    groups = [group_build_options(prop_ids) for prop_ids in buildable_groups(player_id)]
+    
+    # Multiple-choice knapsack: pick one option per group, maximising rent gain within budget
+    # and within the bank's remaining houses and hotels. Costs are counted in units of the gcd
+    # of house costs to keep the table small. States are keyed by (cost, houses, hotels) drawn.
+    # Groups are built one after another in this order, so each group's peak has to fit in
+    # what the bank holds once the groups before it are done.
+    # gcd() of nothing is 0, when every group is already fully built
+    unit = math.gcd(*(options[1]["cost"] for options in groups if len(options) > 1)) or 1
+    capacity = budget // unit
+    best: dict[tuple[int, int, int], tuple[int, list[dict]]] = {(0, 0, 0): (0, [])}
+    for options in groups:
+        expanded: dict[tuple[int, int, int], tuple[int, list[dict]]] = {}
+        for (spent, houses, hotels), (gain, picks) in best.items():
+            for option in options:
+                new_spent = spent + option["cost"] // unit
+                if new_spent > capacity:
+                    break
+                key = (new_spent, houses + option["houses"], hotels + option["hotels"])
+                if houses + option["peak_houses"] > game_state.bank_houses or key[2] > game_state.bank_hotels:
+                    continue
+                new_gain = gain + option["rent_gain"]
+                if key not in expanded or new_gain > expanded[key][0]:
+                    expanded[key] = (new_gain, picks + [option])
+        best = expanded
+    (spent, houses, hotels), (gain, picks) = max(best.items(), key=lambda item: (item[1][0], -item[0][0]))
+    
+    builds = []
+    for option in picks:
+        for prop_id, level in option["levels"].items():
+            current = building_level(game_state.owned_properties[prop_id])
+            if level != current:
+                builds.append({
+                    "property_id": prop_id,
+                    "property_name": get_display_name(prop_id),
+                    "buildings_added": level - current,
+                    "houses": 0 if level == 5 else level,
+                    "has_hotel": level == 5,
+                    "rent": MONOPOLY_RENT_BY_LEVEL[prop_id][level],
+                })
+    return {
+        "player_id": player_id,
+        "budget": budget,
+        "total_cost": spent * unit,
+        "buildings_added": sum(b["buildings_added"] for b in builds),
+        "rent_gain": gain,
+        "houses_from_bank": houses,
+        "hotels_from_bank": hotels,
+        "builds": builds,
+        # One property id per building, in the order they can be placed
+        "build_order": [prop_id for option in picks for prop_id in option["order"]],
+    }
+
+def build_order_shortage(build_order: list[str]) -> Optional[str]:
+    # Replays the plan one building at a time under the same supply rule as
+    # /properties/build, so a batch can never do what single builds would be refused
+    houses, hotels = game_state.bank_houses, game_state.bank_hotels
+    levels: dict[str, int] = {}
+    for prop_id in build_order:
+        level = levels.get(prop_id, building_level(game_state.owned_properties[prop_id]))
+        if level == 4:
+            if hotels < 1:
+                return "The bank has no hotels left"
+            hotels -= 1
+            houses += 4
+        else:
+            if houses < 1:
+                return "The bank has no houses left"
+            houses -= 1
+        levels[prop_id] = level + 1
+    return None
+
+@app.post("/properties/build-plan")
+async def build_plan(request: BuildPlanRequest):
+    if request.player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="Player not found")
+    player = game_state.players[request.player_id]
+    budget = player.cash if request.budget is None else request.budget
+    if budget < 0:
+        raise HTTPException(status_code=400, detail="Budget must not be negative")
+    if budget > player.cash:
+        raise HTTPException(status_code=400, detail="Budget exceeds player's cash")
+    
+    plan = plan_builds(request.player_id, budget)
+    if not request.apply or not plan["builds"]:
+        return plan
+    
+    # The plan was sized to the bank's supply and nothing awaits between planning and here,
+    # so once it passes the same check as single builds the whole batch is reserved in one step
+    shortage = build_order_shortage(plan["build_order"])
+    if shortage is not None:
+        raise HTTPException(status_code=400, detail=shortage)
+    game_state.bank_houses -= plan["houses_from_bank"]
+    game_state.bank_hotels -= plan["hotels_from_bank"]
+    for build in plan["builds"]:
+        owned_prop = game_state.owned_properties[build["property_id"]]
+        owned_prop.houses = build["houses"]
+        owned_prop.has_hotel = build["has_hotel"]
+    player.cash -= plan["total_cost"]
+    
+    message = f"{player.name} built {plan['buildings_added']} buildings for £{plan['total_cost']}"
+    add_transaction("build", player.name, "Bank", plan["total_cost"], message)
+    save_game_state()
+    
+    return {**plan, "message": message, "player_cash": player.cash}
+
+def net_debt_balances() -> dict[Optional[int], int]:
+    # Positive: owed money overall; negative: owes money overall. None is the bank.
+    balances: dict[Optional[int], int] = {}
+    for debt in game_state.debts:
+        balances[debt.from_player_id] = balances.get(debt.from_player_id, 0) - debt.amount
+        balances[debt.to_player_id] = balances.get(debt.to_player_id, 0) + debt.amount
+    return {entity: amount for entity, amount in balances.items() if amount != 0}
+
+# Exact minimisation is exponential in the number of entities with a balance; tables rarely
+# have more than 8 players plus the bank, beyond that a greedy plan is used instead
+SETTLEMENT_EXACT_MAX_ENTITIES = 12
+
+def greedy_transfers(balances: dict[Optional[int], int]) -> list[dict]:
+    # The largest debtor repeatedly pays the largest creditor; at most (entities - 1) transfers
+    debtors = {entity: -amount for entity, amount in balances.items() if amount < 0}
+    creditors = {entity: amount for entity, amount in balances.items() if amount > 0}
+    transfers = []
+    while debtors:
+        debtor = max(debtors, key=lambda e: debtors[e])
+        creditor = max(creditors, key=lambda e: creditors[e])
+        amount = min(debtors[debtor], creditors[creditor])
+        transfers.append({"from_player_id": debtor, "to_player_id": creditor, "amount": amount})
+        debtors[debtor] -= amount
+        creditors[creditor] -= amount
+        if debtors[debtor] == 0:
+            del debtors[debtor]
+        if creditors[creditor] == 0:
+            del creditors[creditor]
+    return transfers
+
+def zero_sum_groups(balances: dict[Optional[int], int]) -> list[list[Optional[int]]]:
+    # Splits the entities into as many groups that net to zero as possible. A group of k
+    # entities settles in k - 1 transfers, so the most groups gives the fewest transfers.
+    entities = list(balances)
+    n = len(entities)
+    full = (1 << n) - 1
+    totals = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        low = (mask & -mask).bit_length() - 1
+        totals[mask] = totals[mask & (mask - 1)] + balances[entities[low]]
+    # groups[mask]: most zero-sum groups that mask's entities can be split into, taking
+    # entities off one at a time so every prefix that nets to zero closes a group
+    groups = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        best = max(groups[mask & ~(1 << i)] for i in range(n) if mask >> i & 1)
+        groups[mask] = best + (1 if totals[mask] == 0 else 0)
+
+    result = []
+    mask, group_start = full, full
+    while mask:
+        i = next(i for i in range(n) if mask >> i & 1
+                 and groups[mask & ~(1 << i)] + (1 if totals[mask] == 0 else 0) == groups[mask])
+        mask &= ~(1 << i)
+        if totals[mask] == 0:
+            result.append([entities[j] for j in range(n) if (group_start & ~mask) >> j & 1])
+            group_start = mask
+    return result
+
+def plan_settlement(balances: dict[Optional[int], int]) -> list[dict]:
+    if len(balances) > SETTLEMENT_EXACT_MAX_ENTITIES:
+        return greedy_transfers(balances)
+    transfers = []
+    for group in zero_sum_groups(balances):
+        transfers += greedy_transfers({entity: balances[entity] for entity in group})
+    return transfers
+
+def debts_view() -> dict:
+    balances = net_debt_balances()
+    return {
+        "debts": [d.model_dump() for d in game_state.debts],
+        "balances": [{"player_id": entity, "name": get_player_name(entity), "balance": amount} for entity, amount in balances.items()],
+        "settlement": plan_settlement(balances),
+    }
+
+@app.get("/debts")
+async def get_debts():
+    return debts_view()
+
+@app.post("/debts")
+async def create_debt(request: CreateDebtRequest):
+    if request.from_player_id is not None and request.from_player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="From player not found")
+    if request.to_player_id is not None and request.to_player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="To player not found")
+    if request.from_player_id == request.to_player_id:
+        raise HTTPException(status_code=400, detail="Debtor and creditor must differ")
+    if request.amount <= 0:
+        raise HTTPException(status_code=400, detail="Amount must be positive")
+    
+    debt = Debt(
+        id=game_state.next_debt_id,
+        from_player_id=request.from_player_id,
+        to_player_id=request.to_player_id,
+        amount=request.amount,
+        description=request.description,
+        timestamp=datetime.now().isoformat(),
+    )
+    game_state.debts.append(debt)
+    game_state.next_debt_id += 1
+    save_game_state()
+    return {"debt": debt.model_dump()}
+
+@app.delete("/debts/{debt_id}")
+async def delete_debt(debt_id: int):
+    if not any(d.id == debt_id for d in game_state.debts):
+        raise HTTPException(status_code=404, detail="Debt not found")
+    game_state.debts = [d for d in game_state.debts if d.id != debt_id]
+    save_game_state()
+    return {"message": "Debt removed"}
+
+@app.post("/debts/settle")
+async def settle_debts():
+    if not game_state.debts:
+        raise HTTPException(status_code=400, detail="No debts to settle")
+    # Debts that cancel out need no transfers at all, but are still cleared
+    transfers = plan_settlement(net_debt_balances())
+    
+    outgoing: dict[int, int] = {}
+    for transfer in transfers:
+        if transfer["from_player_id"] is not None:
+            outgoing[transfer["from_player_id"]] = outgoing.get(transfer["from_player_id"], 0) + transfer["amount"]
+    for player_id, amount in outgoing.items():
+        if game_state.players[player_id].cash < amount:
+            raise HTTPException(status_code=400, detail=f"{get_player_name(player_id)} has insufficient funds to settle £{amount}")
+    
+    for transfer in transfers:
+        from_name = get_player_name(transfer["from_player_id"])
+        to_name = get_player_name(transfer["to_player_id"])
+        if transfer["from_player_id"] is not None:
+            game_state.players[transfer["from_player_id"]].cash -= transfer["amount"]
+        if transfer["to_player_id"] is not None:
+            game_state.players[transfer["to_player_id"]].cash += transfer["amount"]
+        add_transaction("settlement", from_name, to_name, transfer["amount"], f"{from_name} paid £{transfer['amount']} to {to_name} to settle debts")
+    
+    total = sum(t["amount"] for t in transfers)
+    settled = len(game_state.debts)
+    message = f"Settled {settled} debts with {len(transfers)} payments totalling £{total}"
+    # One summary per settle-up, even when the debts cancelled out and nothing was paid
+    add_transaction("settlement_summary", "Debt ledger", "Debt ledger", total, message)
+    game_state.debts.clear()
+    save_game_state()
+    
+    return {
+        "message": message,
+        "transfers": transfers,
+        "player_cash": {pid: p.cash for pid, p in game_state.players.items()},
+    }
+
+BOARD_SQUARES = BASE_BOARD.squares
+JAIL_POSITION = BOARD_SQUARES.index("jail")
+TAX_SQUARES = {"income_tax": 200, "super_tax": 100}
+GO_SALARY = 200
+
+def resolve_landing(player: Player, square: str, dice_total: int) -> dict:
+    # Applies whatever the square does automatically and describes what is left for the table
+    if square in PROPERTIES_DATA:
+        owner_id = game_state.property_owners.get(square)
+        prop_name = get_display_name(square)
+        if owner_id is None and square in open_auctions_by_property:
+            return {"action": "auction_open", "property_id": square, "property_name": prop_name, "auction_id": open_auctions_by_property[square]}
+        if owner_id is None:
+            return {"action": "buy_or_auction", "property_id": square, "property_name": prop_name, "purchase_cost": PROPERTIES_DATA[square]["purchase_cost"]}
+        if owner_id == player.id:
+            return {"action": "none", "property_id": square, "property_name": prop_name}
+        rent = calculate_rent(square, dice_total)
+        if rent == 0:
+            return {"action": "none", "property_id": square, "property_name": prop_name, "message": "No rent due (property mortgaged)"}
+        if player.cash < rent:
+            return {"action": "rent_unpaid", "property_id": square, "property_name": prop_name, "owner_id": owner_id, "amount": rent}
+        owner = game_state.players[owner_id]
+        player.cash -= rent
+        owner.cash += rent
+        add_transaction("rent", player.name, owner.name, rent, f"{player.name} paid £{rent} rent to {owner.name} for {prop_name}", square)
+        return {"action": "rent_paid", "property_id": square, "property_name": prop_name, "owner_id": owner_id, "amount": rent}
+    
+    if square in TAX_SQUARES:
+        tax = TAX_SQUARES[square]
+        if player.cash < tax:
+            return {"action": "tax_unpaid", "amount": tax}
+        player.cash -= tax
+        game_state.free_parking_pot += tax
+        add_transaction("fine", player.name, "Free Parking", tax, f"{player.name} paid £{tax} {square.replace('_', ' ')} to Free Parking")
+        return {"action": "tax_paid", "amount": tax}
+    
+    if square == "free_parking":
+        amount = game_state.free_parking_pot
+        if amount > 0:
+            player.cash += amount
+            game_state.free_parking_pot = 0
+            add_transaction("free_parking", "Free Parking", player.name, amount, f"{player.name} collected £{amount} from Free Parking")
+        return {"action": "free_parking_collected", "amount": amount}
+    
+    if square == "go_to_jail":
+        game_state.positions[player.id] = JAIL_POSITION
+        return {"action": "sent_to_jail"}
+    
+    if square in ("chance", "community_chest"):
+        return {"action": "draw_card", "card": square}
+    
+    return {"action": "none"}
+
+@app.post("/turn/roll")
+async def roll_and_move(request: RollRequest):
+    if request.player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="Player not found")
+    if game_state.turn_order and game_state.turn_order[game_state.current_turn_index] != request.player_id:
+        raise HTTPException(status_code=400, detail="It is not this player's turn")
+    if request.dice is None:
+        dice = [random.randint(1, 6), random.randint(1, 6)]
+    elif len(request.dice) == 2 and all(1 <= d <= 6 for d in request.dice):
+        dice = request.dice
+    else:
+        raise HTTPException(status_code=400, detail="Dice must be two values from 1 to 6")
+    
+    player = game_state.players[request.player_id]
+    dice_total = sum(dice)
+    start = game_state.positions.get(player.id, 0)
+    position = (start + dice_total) % len(BOARD_SQUARES)
+    game_state.positions[player.id] = position
+    
+    passed_go = position < start or position == 0
+    if passed_go:
+        player.cash += GO_SALARY
+        add_transaction("transfer", "Bank", player.name, GO_SALARY, f"{player.name} collected £{GO_SALARY} for passing GO")
+    
+    square = BOARD_SQUARES[position]
+    landing = resolve_landing(player, square, dice_total)
+    
+    doubles = dice[0] == dice[1]
+    payments = []
+    if request.advance_turn and not doubles and game_state.turn_order:
+        payments = advance_turn()
+    save_game_state()
+    
+    return {
+        "dice": dice,
+        "doubles": doubles,
+        "from_position": start,
+        "position": game_state.positions[player.id],
+        "square": square,
+        "square_name": get_display_name(square) if square in PROPERTIES_DATA else square.replace("_", " ").title(),
+        "passed_go": passed_go,
+        "landing": landing,
+        "player_cash": player.cash,
+        "free_parking_pot": game_state.free_parking_pot,
+        "current_turn_index": game_state.current_turn_index,
+        "scheduled_payments": payments,
+    }
+
+def fire_scheduled_payment(payment: ScheduledPayment) -> dict:
+    from_name = get_player_name(payment.from_player_id)
+    to_name = "Free Parking" if payment.is_fine else get_player_name(payment.to_player_id)
+    description = payment.description or "scheduled payment"
+    result = {"payment_id": payment.id, "from_entity": from_name, "to_entity": to_name, "amount": payment.amount}
+    if payment.from_player_id is not None:
+        payer = game_state.players[payment.from_player_id]
+        if payer.cash < payment.amount:
+            # A payment the player can't cover becomes an IOU, cleared later with /debts/settle
+            debt = Debt(
+                id=game_state.next_debt_id,
+                from_player_id=payment.from_player_id,
+                to_player_id=None if payment.is_fine else payment.to_player_id,
+                amount=payment.amount,
+                description=description,
+                timestamp=datetime.now().isoformat(),
+            )
+            game_state.debts.append(debt)
+            game_state.next_debt_id += 1
+            return {**result, "status": "owed", "debt_id": debt.id}
+        payer.cash -= payment.amount
+    if payment.is_fine:
+        game_state.free_parking_pot += payment.amount
+    elif payment.to_player_id is not None:
+        game_state.players[payment.to_player_id].cash += payment.amount
+    add_transaction("scheduled_payment", from_name, to_name, payment.amount,
+                    f"{from_name} paid £{payment.amount} to {to_name} ({description})")
+    return {**result, "status": "paid"}
+
+def advance_turn() -> list[dict]:
+    # Passes play to the next player and fires every scheduled payment now due. Callers
+    # persist once afterwards, covering the turn change and all the payments together.
+    game_state.current_turn_index = (game_state.current_turn_index + 1) % len(game_state.turn_order)
+    game_state.turn_count += 1
+    if game_state.current_turn_index == 0:
+        game_state.round_count += 1
+    fired = []
+    for unit, clock in (("turn", game_state.turn_count), ("round", game_state.round_count)):
+        queue = game_state.payment_queues[unit]
+        while queue and queue[0][0] <= clock:
+            due, payment_id = heapq.heappop(queue)
+            payment = game_state.scheduled_payments.get(payment_id)
+            if payment is None or payment.next_due != due:
+                continue
+            fired.append(fire_scheduled_payment(payment))
+            if payment.remaining is not None:
+                payment.remaining -= 1
+                if payment.remaining == 0:
+                    del game_state.scheduled_payments[payment_id]
+                    continue
+            payment.next_due = due + payment.every
+            game_state.queue_payment(payment)
+    return fired
+
+def scheduled_payments_view() -> dict:
+    payments = sorted(game_state.scheduled_payments.values(), key=lambda p: (p.next_due, p.id))
+    return {
+        "turn_count": game_state.turn_count,
+        "round_count": game_state.round_count,
+        "payments": [p.model_dump() for p in payments],
+    }
+
+@app.get("/scheduled-payments")
+async def get_scheduled_payments():
+    return scheduled_payments_view()
+
+@app.post("/scheduled-payments")
+async def create_scheduled_payment(request: CreateScheduledPaymentRequest):
+    if request.from_player_id is not None and request.from_player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="From player not found")
+    if request.to_player_id is not None and request.to_player_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="To player not found")
+    if request.is_fine and request.to_player_id is not None:
+        raise HTTPException(status_code=400, detail="A fine is paid to Free Parking, not to a player")
+    if request.from_player_id is None and (request.is_fine or request.to_player_id is None):
+        raise HTTPException(status_code=400, detail="The bank can only make scheduled payments to a player")
+    if request.from_player_id is not None and request.from_player_id == request.to_player_id:
+        raise HTTPException(status_code=400, detail="Payer and payee must differ")
+    if request.amount <= 0:
+        raise HTTPException(status_code=400, detail="Amount must be positive")
+    if request.unit not in PAYMENT_UNITS:
+        raise HTTPException(status_code=400, detail=f"Unit must be one of {', '.join(PAYMENT_UNITS)}")
+    if request.every < 1 or (request.start_in is not None and request.start_in < 1):
+        raise HTTPException(status_code=400, detail="Payments must be at least one turn or round apart")
+    if request.occurrences is not None and request.occurrences < 1:
+        raise HTTPException(status_code=400, detail="Occurrences must be positive")
+    
+    clock = game_state.turn_count if request.unit == "turn" else game_state.round_count
+    payment = ScheduledPayment(
+        id=game_state.next_scheduled_payment_id,
+        from_player_id=request.from_player_id,
+        to_player_id=request.to_player_id,
+        is_fine=request.is_fine,
+        amount=request.amount,
+        description=request.description,
+        unit=request.unit,
+        every=request.every,
+        next_due=clock + (request.start_in or request.every),
+        remaining=request.occurrences,
+    )
+    game_state.scheduled_payments[payment.id] = payment
+    game_state.next_scheduled_payment_id += 1
+    game_state.queue_payment(payment)
+    save_game_state()
+    return {"payment": payment.model_dump()}
+
+@app.delete("/scheduled-payments/{payment_id}")
+async def delete_scheduled_payment(payment_id: int):
+    if payment_id not in game_state.scheduled_payments:
+        raise HTTPException(status_code=404, detail="Scheduled payment not found")
+    del game_state.scheduled_payments[payment_id]
+    save_game_state()
+    return {"message": "Scheduled payment cancelled"}
+
+def loan_interest_to_date(loan: Loan, turn: int) -> float:
+    # Interest is worked out from the turn counter when the loan is read, so nothing has to
+    # run each turn. It only ever accrues on principal, never on unpaid interest.
+    elapsed = max(0, turn - loan.balance_turn)
+    return loan.interest_to_date + loan.balance * loan.rate * elapsed / 100
+
+def loan_interest_owed(loan: Loan, turn: Optional[int] = None) -> int:
+    turn = game_state.turn_count if turn is None else turn
+    # Rounded before flooring so float error can't cost the lender a pound
+    return math.floor(round(loan_interest_to_date(loan, turn), 6)) - loan.interest_paid
+
+def loan_balance(loan: Loan, turn: Optional[int] = None) -> int:
+    return loan.balance + loan_interest_owed(loan, turn)
+
+def repay_loan(loan: Loan, amount: int) -> dict:
+    # Interest is paid off before principal
+    interest_owed = loan_interest_owed(loan)
+    amount = min(amount, loan.balance + interest_owed)
+    borrower = game_state.players[loan.borrower_id]
+    borrower.cash -= amount
+    if loan.lender_id is not None:
+        game_state.players[loan.lender_id].cash += amount
+    interest_paid = min(amount, interest_owed)
+    loan.interest_to_date = loan_interest_to_date(loan, game_state.turn_count)
+    loan.interest_paid += interest_paid
+    loan.balance -= amount - interest_paid
+    loan.balance_turn = game_state.turn_count
+    lender_name = get_player_name(loan.lender_id)
+    add_transaction("loan_repayment", borrower.name, lender_name, amount,
+                    f"{borrower.name} repaid £{amount} of loan {loan.id} to {lender_name}")
+    remaining = loan_balance(loan)
+    if remaining == 0:
+        del game_state.loans[loan.id]
+    return {"loan_id": loan.id, "amount": amount, "interest": interest_paid, "remaining": remaining}
+
+def settle_loans(player: Player) -> list[dict]:
+    # Pays off the player's loans, earliest due first, for as long as their cash lasts
+    repayments = []
+    for loan in sorted((l for l in game_state.loans.values() if l.borrower_id == player.id), key=lambda l: (l.due_turn, l.id)):
+        if player.cash <= 0:
+            break
+        repayments.append(repay_loan(loan, player.cash))
+    return repayments
+
+def loan_view(loan: Loan) -> dict:
+    interest_owed = loan_interest_owed(loan)
+    return {
+        **loan.model_dump(),
+        "owed": loan.balance + interest_owed,
+        "interest_accrued": interest_owed,
+        "overdue": game_state.turn_count > loan.due_turn,
+    }
+
+@app.get("/loans")
+async def get_loans():
+    loans = sorted(game_state.loans.values(), key=lambda l: (l.due_turn, l.id))
+    return {"turn_count": game_state.turn_count, "loans": [loan_view(l) for l in loans]}
+
+@app.post("/loans")
+async def create_loan(request: CreateLoanRequest):
+    if request.borrower_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="Borrower not found")
+    if request.lender_id is not None and request.lender_id not in game_state.players:
+        raise HTTPException(status_code=404, detail="Lender not found")
+    if request.lender_id == request.borrower_id:
+        raise HTTPException(status_code=400, detail="Lender and borrower must differ")
+    if request.principal <= 0:
+        raise HTTPException(status_code=400, detail="Principal must be positive")
+    if request.rate < 0:
+        raise HTTPException(status_code=400, detail="Rate cannot be negative")
+    if request.due_in_turns < 1:
+        raise HTTPException(status_code=400, detail="Loan must be due at least one turn from now")
+    if request.lender_id is not None and game_state.players[request.lender_id].cash < request.principal:
+        raise HTTPException(status_code=400, detail="Lender has insufficient funds")
+    
+    loan = Loan(
+        id=game_state.next_loan_id,
+        lender_id=request.lender_id,
+        borrower_id=request.borrower_id,
+        principal=request.principal,
+        rate=request.rate,
+        start_turn=game_state.turn_count,
+        due_turn=game_state.turn_count + request.due_in_turns,
+        balance=request.principal,
+        balance_turn=game_state.turn_count,
+        description=request.description,
+        timestamp=datetime.now().isoformat(),
+    )
+    if request.lender_id is not None:
+        game_state.players[request.lender_id].cash -= request.principal
+    borrower = game_state.players[request.borrower_id]
+    borrower.cash += request.principal
+    lender_name = get_player_name(request.lender_id)
+    add_transaction("loan", lender_name, borrower.name, request.principal,
+                    f"{lender_name} lent £{request.principal} to {borrower.name} at {request.rate:g}% per turn")
+    game_state.loans[loan.id] = loan
+    game_state.next_loan_id += 1
+    save_game_state()
+    return {"loan": loan_view(loan)}
+
+@app.post("/loans/{loan_id}/repay")
+async def repay_loan_endpoint(loan_id: int, request: RepayLoanRequest):
+    if loan_id not in game_state.loans:
+        raise HTTPException(status_code=404, detail="Loan not found")
+    loan = game_state.loans[loan_id]
+    amount = loan_balance(loan) if request.amount is None else request.amount
+    if amount <= 0:
+        raise HTTPException(status_code=400, detail="Amount must be positive")
+    if game_state.players[loan.borrower_id].cash < min(amount, loan_balance(loan)):
+        raise HTTPException(status_code=400, detail="Insufficient funds")
+    repayment = repay_loan(loan, amount)
+    save_game_state()
+    return {**repayment, "player_cash": game_state.players[loan.borrower_id].cash}
+
+# When this server runs one table of a tournament, its standings are pushed to the
+# tournament's report URL (see POST /tournaments/{id}/tables) whenever they change
+TOURNAMENT_REPORT_URL = os.environ.get("TOURNAMENT_REPORT_URL")
+TOURNAMENT_REPORT_MIN_INTERVAL_SECONDS = 1.0
+
+def player_standings(state: GameState) -> list[dict]:
+    # Net worth is what the player would hold after cashing out to the bank
+    worth = {pid: p.cash for pid, p in state.players.items()}
+    for prop_id, owner_id in state.property_owners.items():
+        if owner_id not in worth:
+            continue
+        prop_data = PROPERTIES_DATA[prop_id]
+        owned_prop = state.owned_properties.get(prop_id)
+        worth[owner_id] += prop_data["purchase_cost"]
+        if owned_prop:
+            if owned_prop.is_mortgaged:
+                worth[owner_id] -= prop_data["mortgage_value"]
+            worth[owner_id] += building_level(owned_prop) * (prop_data.get("house_cost", 0) // 2)
+    return [{"player_id": pid, "name": p.name, "cash": p.cash, "net_worth": worth[pid]} for pid, p in state.players.items()]
+
+def post_json(url: str, payload) -> None:
+    req = urllib.request.Request(url, data=dumps_json(payload), headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(req, timeout=5) as response:
+        response.read()
+
+class StandingsReporter:
+    def __init__(self, url: Optional[str]):
+        self.url = url
+        self.last_sent: Optional[list[dict]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.changed = asyncio.Event()
+
+    def notify(self):
+        if self.task is not None:
+            self.changed.set()
+
+    async def run(self):
+        while True:
+            await self.changed.wait()
+            self.changed.clear()
+            standings = player_standings(game_state)
+            if standings != self.last_sent:
+                try:
+                    await asyncio.to_thread(post_json, self.url, {"players": standings})
+                    self.last_sent = standings
+                except OSError as e:
+                    logger.warning("Failed to report standings to %s: %s", self.url, e)
+                    self.changed.set()
+                except Exception:
+                    # Anything else (a bad URL, a serialization bug) must not end reporting for good
+                    logger.exception("Failed to report standings to %s", self.url)
+                    self.changed.set()
+            await asyncio.sleep(TOURNAMENT_REPORT_MIN_INTERVAL_SECONDS)
+
+    def start(self):
+        if self.url and self.task is None:
+            self.changed = asyncio.Event()
+            self.changed.set()
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+standings_reporter = StandingsReporter(TOURNAMENT_REPORT_URL)
+
+class Tournament:
+    def __init__(self, tournament_id: int, name: str):
+        self.id = tournament_id
+        self.name = name
+        self.tables: dict[int, dict] = {}
+        self.next_table_id = 1
+        # (table_id, player_id) -> standing, plus the same entries kept sorted by net worth
+        # so reports update the leaderboard in O(log n) and reads never rescan tables
+        self.standings: dict[tuple[int, int], dict] = {}
+        self.leaderboard: list[tuple[int, int, int]] = []
+
+    def add_table(self, name: str) -> dict:
+        table = {"id": self.next_table_id, "name": name, "total_net_worth": 0, "players": 0, "last_report": None}
+        self.tables[table["id"]] = table
+        self.next_table_id += 1
+        return table
+
+    def remove_standing(self, key: tuple[int, int]):
+        standing = self.standings.pop(key)
+        entry = (-standing["net_worth"], key[0], key[1])
+        del self.leaderboard[bisect.bisect_left(self.leaderboard, entry)]
+
+    def report(self, table_id: int, players: list[PlayerStanding]):
+        table = self.tables[table_id]
+        reported = {p.player_id: p for p in players}
+        for key in [k for k in self.standings if k[0] == table_id and k[1] not in reported]:
+            table["total_net_worth"] -= self.standings[key]["net_worth"]
+            self.remove_standing(key)
+        for player in players:
+            key = (table_id, player.player_id)
+            standing = self.standings.get(key)
+            if standing is not None and standing["net_worth"] == player.net_worth:
+                standing.update(name=player.name, cash=player.cash)
+                continue
+            if standing is not None:
+                table["total_net_worth"] -= standing["net_worth"]
+                self.remove_standing(key)
+            self.standings[key] = {"name": player.name, "cash": player.cash, "net_worth": player.net_worth}
+            bisect.insort(self.leaderboard, (-player.net_worth, table_id, player.player_id))
+            table["total_net_worth"] += player.net_worth
+        table["players"] = len(reported)
+        table["last_report"] = datetime.now().isoformat()
+
+    def leaderboard_view(self, limit: Optional[int] = None) -> list[dict]:
+        entries = self.leaderboard if limit is None else self.leaderboard[:limit]
+        rows = []
+        for rank, (_, table_id, player_id) in enumerate(entries, start=1):
+            standing = self.standings[(table_id, player_id)]
+            rows.append({"rank": rank, "table_id": table_id, "table_name": self.tables[table_id]["name"], "player_id": player_id, **standing})
+        return rows
+
+tournaments: dict[int, Tournament] = {}
+next_tournament_id = 1
+
+def get_tournament_or_404(tournament_id: int) -> Tournament:
+    if tournament_id not in tournaments:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return tournaments[tournament_id]
+
+@app.post("/tournaments")
+async def create_tournament(request: CreateTournamentRequest):
+    global next_tournament_id
+    tournament = Tournament(next_tournament_id, request.name)
+    tournaments[tournament.id] = tournament
+    next_tournament_id += 1
+    return {"tournament": {"id": tournament.id, "name": tournament.name}}
+
+@app.get("/tournaments")
+async def list_tournaments():
+    return {"tournaments": [{"id": t.id, "name": t.name, "tables": len(t.tables)} for t in tournaments.values()]}
+
+@app.post("/tournaments/{tournament_id}/tables")
+async def create_tournament_table(tournament_id: int, request: CreateTableRequest):
+    tournament = get_tournament_or_404(tournament_id)
+    table = tournament.add_table(request.name)
+    return {"table": table, "report_path": f"/tournaments/{tournament_id}/tables/{table['id']}/standings"}
+
+@app.post("/tournaments/{tournament_id}/tables/{table_id}/standings")
+async def report_table_standings(tournament_id: int, table_id: int, request: TableStandingsReport):
+    tournament = get_tournament_or_404(tournament_id)
+    if table_id not in tournament.tables:
+        raise HTTPException(status_code=404, detail="Table not found")
+    tournament.report(table_id, request.players)
+    return {"table": tournament.tables[table_id]}
+
+@app.get("/tournaments/{tournament_id}/leaderboard")
+async def get_tournament_leaderboard(tournament_id: int, limit: Optional[int] = None):
+    tournament = get_tournament_or_404(tournament_id)
+    return {
+        "tournament": {"id": tournament.id, "name": tournament.name},
+        "tables": list(tournament.tables.values()),
+        "leaderboard": tournament.leaderboard_view(limit),
+    }
+
+# Spectator screens poll far more often than the game changes, so their reads are answered
+# from immutable snapshots serialized and compressed once per commit. A commit only bumps the
+# generation; the first read after it builds a new snapshot and swaps it in whole, so readers
+# never see a half-built one and the game state is never touched per request.
+class SpectatorSnapshot:
+    def __init__(self, generation: int, content):
+        self.generation = generation
+        self.etag = f'"{SERVER_EPOCH}-{generation}"'
+        body = dumps_json(content)
+        self.bodies = {"identity": body}
+        if len(body) >= COMPRESSION_MINIMUM_SIZE:
+            self.bodies["gzip"] = gzip.compress(body, compresslevel=9)
+            if brotli is not None:
+                self.bodies["br"] = brotli.compress(body, quality=11)
+
+    def response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if self.etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.bodies:
+                headers["Content-Encoding"] = encoding
+                return Response(self.bodies[encoding], media_type="application/json", headers=headers)
+        return Response(self.bodies["identity"], media_type="application/json", headers=headers)
+
+class SpectatorFeed:
+    def __init__(self):
+        self.generation = 0
+        self.snapshots: dict[str, SpectatorSnapshot] = {}
+
+    def invalidate(self):
+        self.generation += 1
+
+    def snapshot(self, name: str, build) -> SpectatorSnapshot:
+        snapshot = self.snapshots.get(name)
+        if snapshot is None or snapshot.generation != self.generation:
+            snapshot = SpectatorSnapshot(self.generation, build())
+            self.snapshots[name] = snapshot
+        return snapshot
+
+spectator_feed = SpectatorFeed()
+
+def spectator_standings() -> dict:
+    standings = sorted(player_standings(game_state), key=lambda s: s["net_worth"], reverse=True)
+    current_player_id = game_state.turn_order[game_state.current_turn_index] if game_state.turn_order else None
+    return {
+        "standings": [{"rank": rank, **standing} for rank, standing in enumerate(standings, start=1)],
+        "free_parking_pot": game_state.free_parking_pot,
+        "current_player_id": current_player_id,
+    }
+
+@app.get("/spectate/state")
+async def spectate_state(request: Request):
+    return spectator_feed.snapshot("state", lambda: game_state_view(game_state)).response(request)
+
+@app.get("/spectate/standings")
+async def spectate_standings(request: Request):
+    return spectator_feed.snapshot("standings", spectator_standings).response(request)
 
 STATIC_DIR = os.path.join(os.path.dirname(__file__), "..", "static")
 
+PRECOMPRESSED_EXTENSIONS = (".js", ".css", ".html", ".svg", ".json", ".txt", ".map")
+PRECOMPRESSED_ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+def precompress_static_assets(directory: str):
+    if not os.path.isdir(directory):
+        return
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            if not filename.endswith(PRECOMPRESSED_EXTENSIONS):
+                continue
+            path = os.path.join(root, filename)
+            try:
+                precompress_static_asset(path)
+            except OSError as e:
+                # e.g. a read-only deploy; the file is still served, just compressed per request
+                logger.warning("Skipping precompression of %s: %s", path, e)
+
+def precompress_static_asset(path: str):
+    if os.path.getsize(path) < COMPRESSION_MINIMUM_SIZE:
+        return
+    with open(path, "rb") as f:
+        body = f.read()
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if encoding == "br" and brotli is None:
+            continue
+        target = path + suffix
+        if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+            continue
+        compressed = brotli.compress(body, quality=11) if encoding == "br" else gzip.compress(body, compresslevel=9)
+        if len(compressed) < len(body):
+            with open(target, "wb") as f:
+                f.write(compressed)
+
+class CachedStaticFiles(StaticFiles):
+    # Vite puts a content hash in every asset filename, so assets never change under the same URL
+    # and can be cached forever. A precompressed .br/.gz sibling is served when the client accepts it.
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if isinstance(response, FileResponse) and response.status_code == 200:
+            accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+            for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+                compressed_path = str(response.path) + suffix
+                if encoding in accepted and os.path.isfile(compressed_path):
+                    response = FileResponse(
+                        compressed_path,
+                        media_type=response.media_type,
+                        headers={"Content-Encoding": encoding},
+                    )
+                    break
+            response.headers["Vary"] = "Accept-Encoding"
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
 @app.get("/")
 async def serve_index():
-    return FileResponse(os.path.join(STATIC_DIR, "index.html"))
+    # index.html references the current asset hashes, so it must always be revalidated
+    return FileResponse(os.path.join(STATIC_DIR, "index.html"), headers={"Cache-Control": "no-cache"})
 
 if os.path.exists(STATIC_DIR):
-    app.mount("/assets", StaticFiles(directory=os.path.join(STATIC_DIR, "assets")), name="assets")
+    app.mount("/assets", CachedStaticFiles(directory=os.path.join(STATIC_DIR, "assets")), name="assets")
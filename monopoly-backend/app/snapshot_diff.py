@@ -0,0 +1,111 @@
+"""Structured comparison of two game snapshots.
+
+Works on the plain snapshot dicts written to game_state.json (and kept in the server's
+history), so it has no dependency on the running server. Run as a CLI to compare two save
+files, or two points in a running server's history:
+
+    python -m app.snapshot_diff before.json after.json
+    python -m app.snapshot_diff --server http://localhost:8000 --from 10 --to 42
+"""
+import argparse
+import json
+import sys
+import urllib.parse
+import urllib.request
+from typing import Optional
+
+# Top-level snapshot fields covered by a dedicated section of the diff
+COMPARED_FIELDS = ("players", "owned_properties", "property_owners", "free_parking_pot")
+IGNORED_FIELDS = ("transactions", "next_transaction_id")
+
+def building_level(owned: Optional[dict]) -> int:
+    if not owned:
+        return 0
+    return 5 if owned.get("has_hotel") else owned.get("houses", 0)
+
+def is_mortgaged(owned: Optional[dict]) -> bool:
+    return bool(owned and owned.get("is_mortgaged"))
+
+def compare_snapshots(before: dict, after: dict) -> dict:
+    before_players = before.get("players", {})
+    after_players = after.get("players", {})
+    cash = []
+    for key, player in after_players.items():
+        old = before_players.get(key)
+        if old is not None and old["cash"] != player["cash"]:
+            cash.append({
+                "player_id": player["id"],
+                "name": player["name"],
+                "before": old["cash"],
+                "after": player["cash"],
+                "delta": player["cash"] - old["cash"],
+            })
+    players_added = [{"player_id": p["id"], "name": p["name"], "cash": p["cash"]}
+                     for key, p in after_players.items() if key not in before_players]
+    players_removed = [{"player_id": p["id"], "name": p["name"], "cash": p["cash"]}
+                       for key, p in before_players.items() if key not in after_players]
+
+    before_owners = before.get("property_owners", {})
+    after_owners = after.get("property_owners", {})
+    before_owned = before.get("owned_properties", {})
+    after_owned = after.get("owned_properties", {})
+    ownership, buildings, mortgages = [], [], []
+    for prop_id in sorted(set(before_owners) | set(after_owners) | set(before_owned) | set(after_owned)):
+        if before_owners.get(prop_id) != after_owners.get(prop_id):
+            ownership.append({"property_id": prop_id, "before": before_owners.get(prop_id), "after": after_owners.get(prop_id)})
+        old_level, new_level = building_level(before_owned.get(prop_id)), building_level(after_owned.get(prop_id))
+        if old_level != new_level:
+            buildings.append({"property_id": prop_id, "before": old_level, "after": new_level})
+        old_mortgaged, new_mortgaged = is_mortgaged(before_owned.get(prop_id)), is_mortgaged(after_owned.get(prop_id))
+        if old_mortgaged != new_mortgaged:
+            mortgages.append({"property_id": prop_id, "before": old_mortgaged, "after": new_mortgaged})
+
+    old_pot, new_pot = before.get("free_parking_pot", 0), after.get("free_parking_pot", 0)
+    other = sorted(
+        key for key in set(before) | set(after)
+        if key not in COMPARED_FIELDS and key not in IGNORED_FIELDS and before.get(key) != after.get(key)
+    )
+    return {
+        "cash": cash,
+        "players_added": players_added,
+        "players_removed": players_removed,
+        "free_parking_pot": {"before": old_pot, "after": new_pot, "delta": new_pot - old_pot} if old_pot != new_pot else None,
+        "ownership": ownership,
+        "buildings": buildings,
+        "mortgages": mortgages,
+        "other_changed_fields": other,
+    }
+
+def load_snapshot(path: str) -> dict:
+    with open(path, "rb") as f:
+        return json.load(f)
+
+def fetch_diff(server: str, from_transaction: int, to_transaction: Optional[int]) -> dict:
+    params = {"from_transaction": from_transaction}
+    if to_transaction is not None:
+        params["to_transaction"] = to_transaction
+    url = f"{server.rstrip('/')}/game/diff?{urllib.parse.urlencode(params)}"
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.load(response)
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare two game snapshots")
+    parser.add_argument("files", nargs="*", help="Two game_state.json files: before and after")
+    parser.add_argument("--server", help="Compare two points in this server's history instead")
+    parser.add_argument("--from", dest="from_transaction", type=int, help="Transaction id to compare from")
+    parser.add_argument("--to", dest="to_transaction", type=int, help="Transaction id to compare to (default: now)")
+    args = parser.parse_args(argv)
+
+    if args.server:
+        if args.from_transaction is None:
+            parser.error("--server needs --from")
+        diff = fetch_diff(args.server, args.from_transaction, args.to_transaction)
+    elif len(args.files) == 2:
+        diff = compare_snapshots(load_snapshot(args.files[0]), load_snapshot(args.files[1]))
+    else:
+        parser.error("give two snapshot files, or --server with --from")
+    json.dump(diff, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+# Tests drive the app far faster than a table would, so rate limiting is lifted and saves go
+# to a scratch file; this must happen before the app is imported
+os.environ.setdefault("SAVE_FILE", os.path.join(tempfile.mkdtemp(), "game_state.json"))
+for name in ("RATE_LIMIT_GAME_PER_SECOND", "RATE_LIMIT_GAME_BURST",
+             "RATE_LIMIT_CLIENT_PER_SECOND", "RATE_LIMIT_CLIENT_BURST",
+             "RATE_LIMIT_TOURNAMENT_PER_SECOND", "RATE_LIMIT_TOURNAMENT_BURST", "MAX_PENDING_REQUESTS"):
+    os.environ.setdefault(name, "1000000000")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+@pytest.fixture
+def client():
+    with TestClient(main.app) as client:
+        client.post("/game/reset").raise_for_status()
+        yield client
+
+@pytest.fixture
+def add_player(client):
+    def add(name: str) -> int:
+        response = client.post("/players", json={"name": name})
+        response.raise_for_status()
+        return response.json()["player"]["id"]
+    return add
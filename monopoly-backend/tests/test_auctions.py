@@ -0,0 +1,43 @@
+from app import main
+
+def open_auction(client, property_id="old_kent_road"):
+    response = client.post("/auctions", json={"property_id": property_id, "duration_seconds": 60})
+    response.raise_for_status()
+    return response.json()["auction"]["id"]
+
+def test_highest_bid_still_covered_wins(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    auction_id = open_auction(client)
+    client.post(f"/auctions/{auction_id}/bid", json={"player_id": alice, "amount": 50}).raise_for_status()
+    client.post(f"/auctions/{auction_id}/bid", json={"player_id": bob, "amount": 80}).raise_for_status()
+    assert client.post(f"/auctions/{auction_id}/bid", json={"player_id": alice, "amount": 80}).status_code == 400
+    # Bob spends his cash before the auction closes, so Alice's bid wins
+    client.post("/transfer", json={"from_player_id": bob, "amount": 1450, "is_fine": True}).raise_for_status()
+    auction = client.post(f"/auctions/{auction_id}/close").json()["auction"]
+    assert (auction["status"], auction["winner_id"], auction["winning_bid"]) == ("sold", alice, 50)
+    assert main.game_state.property_owners["old_kent_road"] == alice
+
+def test_one_open_auction_per_property(client):
+    open_auction(client)
+    response = client.post("/auctions", json={"property_id": "old_kent_road"})
+    assert response.status_code == 400
+
+def test_finished_auctions_are_pruned(client, monkeypatch):
+    finished = open_auction(client)
+    client.post(f"/auctions/{finished}/close").raise_for_status()
+    running = open_auction(client, "whitechapel_road")
+    assert {a["id"] for a in client.get("/auctions").json()["auctions"]} == {finished, running}
+
+    monkeypatch.setattr(main, "AUCTION_RETENTION_SECONDS", -1)
+    assert [a["id"] for a in client.get("/auctions").json()["auctions"]] == [running]
+    assert client.get(f"/auctions/{finished}").status_code == 404
+
+def test_landing_on_property_under_auction(client, add_player):
+    alice = add_player("Alice")
+    auction_id = open_auction(client)
+    # Two past the last square is Old Kent Road
+    main.game_state.positions[alice] = len(main.BOARD_SQUARES) - 1
+    landing = client.post("/turn/roll", json={"player_id": alice, "dice": [1, 1]}).json()["landing"]
+    assert landing == {"action": "auction_open", "property_id": "old_kent_road",
+                       "property_name": "Old Kent Road", "auction_id": auction_id}
@@ -0,0 +1,34 @@
+import json
+import shutil
+
+import pytest
+
+from app import main
+
+@pytest.fixture
+def boards_dir(tmp_path, monkeypatch):
+    for name in ("london", "edinburgh"):
+        shutil.copy(f"{main.BOARDS_DIR}/{name}.json", tmp_path)
+    monkeypatch.setattr(main, "BOARDS_DIR", str(tmp_path))
+    main.load_board_pack.cache_clear()
+    monkeypatch.setattr(main, "BASE_BOARD", main.load_board_pack(main.DEFAULT_BOARD))
+    yield tmp_path
+    main.load_board_pack.cache_clear()
+
+def write_pack(directory, name, content):
+    (directory / f"{name}.json").write_text(content if isinstance(content, str) else json.dumps(content))
+
+def test_invalid_packs_are_skipped(boards_dir, caplog):
+    write_pack(boards_dir, "broken", "{not json")
+    write_pack(boards_dir, "listed", [1, 2, 3])
+    write_pack(boards_dir, "orphan", {"extends": "atlantis", "names": {}})
+    write_pack(boards_dir, "loop", {"extends": "loop"})
+    write_pack(boards_dir, "standalone", {"properties": {}})
+    assert main.available_board_packs() == ["london", "edinburgh"]
+    for name in ("broken", "listed", "orphan", "loop", "standalone"):
+        assert f"Skipping board pack {name}" in caplog.text
+
+def test_valid_edition_is_listed(boards_dir):
+    write_pack(boards_dir, "cardiff", {"extends": "london", "names": {"old_kent_road": "Queen Street"}})
+    assert main.available_board_packs() == ["london", "cardiff", "edinburgh"]
+    assert main.load_board_pack("cardiff").display_names["old_kent_road"] == "Queen Street"
@@ -0,0 +1,93 @@
+from app import main
+
+BROWNS = ("old_kent_road", "whitechapel_road")
+
+def own_browns(client, player_id):
+    for prop_id in BROWNS:
+        client.post("/properties/buy", json={"player_id": player_id, "property_id": prop_id}).raise_for_status()
+
+def test_plan_builds_evenly_within_budget(client, add_player):
+    player_id = add_player("Alice")
+    own_browns(client, player_id)
+    response = client.post("/properties/build-plan", json={"player_id": player_id, "budget": 150})
+    assert response.status_code == 200
+    plan = response.json()
+    assert plan["total_cost"] == 150
+    assert plan["buildings_added"] == 3
+    assert sorted(b["houses"] for b in plan["builds"]) == [1, 2]
+
+def test_plan_applies_builds(client, add_player):
+    player_id = add_player("Alice")
+    own_browns(client, player_id)
+    response = client.post("/properties/build-plan", json={"player_id": player_id, "budget": 100, "apply": True})
+    assert response.status_code == 200
+    assert [main.game_state.owned_properties[p].houses for p in BROWNS] == [1, 1]
+    assert main.game_state.bank_houses == main.BANK_HOUSES - 2
+
+def test_plan_for_fully_developed_groups_builds_nothing(client, add_player):
+    player_id = add_player("Alice")
+    own_browns(client, player_id)
+    for _ in range(5):
+        for prop_id in BROWNS:
+            client.post("/properties/build", json={"player_id": player_id, "property_id": prop_id}).raise_for_status()
+    assert all(main.game_state.owned_properties[p].has_hotel for p in BROWNS)
+
+    response = client.post("/properties/build-plan", json={"player_id": player_id})
+    assert response.status_code == 200
+    assert response.json()["builds"] == []
+    assert response.json()["total_cost"] == 0
+
+def test_plan_with_no_monopolies_builds_nothing(client, add_player):
+    player_id = add_player("Alice")
+    response = client.post("/properties/build-plan", json={"player_id": player_id, "budget": 500})
+    assert response.status_code == 200
+    assert response.json()["builds"] == []
+
+def test_plan_needs_houses_before_hotels(client, add_player):
+    player_id = add_player("Alice")
+    own_browns(client, player_id)
+    main.game_state.bank_houses = 0
+    response = client.post("/properties/build-plan", json={"player_id": player_id, "apply": True})
+    assert response.status_code == 200
+    assert response.json()["builds"] == []
+    assert [main.game_state.owned_properties[p].houses for p in BROWNS] == [0, 0]
+
+def test_plan_builds_as_far_as_the_houses_go(client, add_player):
+    player_id = add_player("Alice")
+    own_browns(client, player_id)
+    # Hotels on both browns need eight houses on the way up; seven only reach 4 and 3
+    main.game_state.bank_houses = 7
+    plan = client.post("/properties/build-plan", json={"player_id": player_id}).json()
+    assert sorted(b["houses"] for b in plan["builds"]) == [3, 4]
+    assert not any(b["has_hotel"] for b in plan["builds"])
+    assert len(plan["build_order"]) == 7
+
+    main.game_state.bank_houses = 8
+    plan = client.post("/properties/build-plan", json={"player_id": player_id, "apply": True}).json()
+    assert all(b["has_hotel"] for b in plan["builds"])
+    assert main.game_state.bank_houses == 8
+    assert main.game_state.bank_hotels == main.BANK_HOTELS - 2
+
+def test_build_order_follows_single_build_supply_rule(client, add_player):
+    player_id = add_player("Alice")
+    own_browns(client, player_id)
+    hotel_first = ["old_kent_road"] * 5
+    main.game_state.bank_houses = 3
+    assert main.build_order_shortage(hotel_first) == "The bank has no houses left"
+    main.game_state.bank_houses = 4
+    main.game_state.bank_hotels = 0
+    assert main.build_order_shortage(hotel_first) == "The bank has no hotels left"
+    main.game_state.bank_hotels = 1
+    assert main.build_order_shortage(hotel_first + ["whitechapel_road"] * 4) is None
+
+def test_apply_rejects_plan_the_bank_cannot_supply(client, add_player, monkeypatch):
+    player_id = add_player("Alice")
+    own_browns(client, player_id)
+    plan = main.plan_builds(player_id, 100)
+    main.game_state.bank_houses = 1
+    monkeypatch.setattr(main, "plan_builds", lambda *args: plan)
+    response = client.post("/properties/build-plan", json={"player_id": player_id, "budget": 100, "apply": True})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "The bank has no houses left"}
+    assert [main.game_state.owned_properties[p].houses for p in BROWNS] == [0, 0]
+    assert main.game_state.players[player_id].cash == 1380
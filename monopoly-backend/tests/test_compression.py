@@ -0,0 +1,77 @@
+import builtins
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from fastapi.testclient import TestClient
+
+from app import main
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+def fill_log(client, add_player):
+    alice = add_player("Alice")
+    for _ in range(30):
+        client.post("/transfer", json={"from_player_id": alice, "amount": 1, "is_fine": True}).raise_for_status()
+
+def test_large_response_is_compressed(client, add_player):
+    fill_log(client, add_player)
+    response = client.get("/transactions", headers=GZIP)
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()["transactions"]) == 30
+
+def test_small_response_passes_through(client):
+    response = client.get("/game/revision", headers=GZIP)
+    assert "content-encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["vary"]
+
+def test_no_compression_without_accept_encoding(client, add_player):
+    fill_log(client, add_player)
+    response = client.get("/transactions", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+@pytest.fixture
+def assets(tmp_path):
+    (tmp_path / "app-1a2b3c.js").write_text("console.log('hello');\n" * 200)
+    (tmp_path / "tiny-4d5e6f.js").write_text("x")
+    return tmp_path
+
+@pytest.fixture
+def assets_client(assets):
+    app = Starlette(routes=[Mount("/assets", main.CachedStaticFiles(directory=str(assets)))])
+    with TestClient(app) as client:
+        yield client
+
+def test_precompressed_asset_is_served(assets, assets_client):
+    main.precompress_static_assets(str(assets))
+    assert (assets / "app-1a2b3c.js.gz").exists()
+    assert not (assets / "tiny-4d5e6f.js.gz").exists()
+
+    response = assets_client.get("/assets/app-1a2b3c.js", headers=GZIP)
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) == (assets / "app-1a2b3c.js.gz").stat().st_size
+    assert response.text == (assets / "app-1a2b3c.js").read_text()
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    plain = assets_client.get("/assets/app-1a2b3c.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+def test_missing_asset_is_not_cached_forever(assets_client):
+    response = assets_client.get("/assets/missing-000000.js")
+    assert response.status_code == 404
+    assert "cache-control" not in response.headers
+
+def test_read_only_assets_are_skipped(assets, monkeypatch, caplog):
+    def read_only_open(path, mode="r", *args, **kwargs):
+        if "w" in mode:
+            raise PermissionError(30, "Read-only file system", path)
+        return builtins.open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(main, "open", read_only_open, raising=False)
+    main.precompress_static_assets(str(assets))
+    assert not (assets / "app-1a2b3c.js.gz").exists()
+    assert "Skipping precompression" in caplog.text
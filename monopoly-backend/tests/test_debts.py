@@ -0,0 +1,59 @@
+from app import main
+
+def add_debt(client, from_id, to_id, amount):
+    response = client.post("/debts", json={"from_player_id": from_id, "to_player_id": to_id, "amount": amount})
+    response.raise_for_status()
+
+def test_settlement_pays_net_balances(client, add_player):
+    a, b, c, d = (add_player(name) for name in "ABCD")
+    add_debt(client, a, b, 10)
+    add_debt(client, c, d, 20)
+    add_debt(client, a, d, 5)
+    add_debt(client, c, b, 5)
+    balances = main.net_debt_balances()
+    assert balances == {a: -15, b: 15, c: -25, d: 25}
+
+    response = client.post("/debts/settle")
+    assert response.status_code == 200
+    assert len(response.json()["transfers"]) == 2
+    cash = response.json()["player_cash"]
+    assert cash == {str(a): 1485, str(b): 1515, str(c): 1475, str(d): 1525}
+
+def test_plan_settlement_is_minimal():
+    # Largest-debtor-pays-largest-creditor needs five transfers here; splitting into the
+    # zero-sum groups {1, 4, 6} and {2, 3, 5} needs four
+    balances = {1: 40, 2: -45, 3: 30, 4: -35, 5: 15, 6: -5}
+    transfers = main.plan_settlement(balances)
+    assert len(transfers) == 4
+    remaining = dict(balances)
+    for t in transfers:
+        remaining[t["from_player_id"]] += t["amount"]
+        remaining[t["to_player_id"]] -= t["amount"]
+    assert all(v == 0 for v in remaining.values())
+
+def test_debts_that_cancel_out_are_cleared(client, add_player):
+    a, b = add_player("A"), add_player("B")
+    add_debt(client, a, b, 10)
+    add_debt(client, b, a, 10)
+    response = client.post("/debts/settle")
+    assert response.status_code == 200
+    assert response.json()["transfers"] == []
+    assert client.get("/debts").json()["debts"] == []
+    assert {p.cash for p in main.game_state.players.values()} == {1500}
+    [summary] = main.game_state.transactions
+    assert (summary.type, summary.amount) == ("settlement_summary", 0)
+    assert summary.description == "Settled 2 debts with 0 payments totalling £0"
+
+def test_settlement_records_legs_and_summary(client, add_player):
+    a, b, c = add_player("A"), add_player("B"), add_player("C")
+    add_debt(client, a, b, 40)
+    add_debt(client, c, b, 15)
+    client.post("/debts/settle").raise_for_status()
+    transactions = main.game_state.transactions
+    assert [t.type for t in transactions] == ["settlement", "settlement", "settlement_summary"]
+    assert sorted(t.amount for t in transactions[:2]) == [15, 40]
+    assert transactions[2].amount == 55
+    assert transactions[2].description == "Settled 2 debts with 2 payments totalling £55"
+
+def test_settle_with_no_debts_is_rejected(client):
+    assert client.post("/debts/settle").status_code == 400
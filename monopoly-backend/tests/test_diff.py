@@ -0,0 +1,34 @@
+def snapshot(cash, **extra):
+    return {
+        "players": {str(i): {"id": i, "name": name, "cash": c} for i, (name, c) in enumerate(cash.items(), 1)},
+        **extra,
+    }
+
+def test_compares_uploaded_snapshots(client):
+    before = snapshot({"Alice": 1500, "Bob": 1500}, property_owners={"boardwalk": 1}, version="classic")
+    after = snapshot({"Alice": 1100, "Bob": 1500}, property_owners={}, free_parking_pot=400, version="mega")
+    diff = client.post("/game/diff", json={"before": before, "after": after}).json()
+    assert diff["cash"] == [{"player_id": 1, "name": "Alice", "before": 1500, "after": 1100, "delta": -400}]
+    assert diff["ownership"] == [{"property_id": "boardwalk", "before": 1, "after": None}]
+    assert diff["free_parking_pot"] == {"before": 0, "after": 400, "delta": 400}
+    assert diff["other_changed_fields"] == ["version"]
+
+def test_malformed_snapshot_is_rejected(client):
+    for body in (
+        {"before": {"players": [{"id": 1}]}, "after": {"players": []}},
+        {"before": {"players": {"1": {"id": 1}}}, "after": {}},
+        {"before": {"owned_properties": {"boardwalk": "yes"}}, "after": {}},
+        {"before": {}},
+    ):
+        assert client.post("/game/diff", json=body).status_code == 422, body
+
+def test_diff_between_transactions(client, add_player):
+    alice = add_player("Alice")
+    client.post("/transfer", json={"from_player_id": alice, "amount": 100, "is_fine": True}).raise_for_status()
+    diff = client.get("/game/diff", params={"from_transaction": 0}).json()
+    assert diff["cash"] == [{"player_id": alice, "name": "Alice", "before": 1500, "after": 1400, "delta": -100}]
+    assert diff["free_parking_pot"]["delta"] == 100
+    assert [t["amount"] for t in diff["transactions"]] == [100]
+
+def test_diff_rejects_unknown_transactions(client):
+    assert client.get("/game/diff", params={"from_transaction": 99}).status_code == 404
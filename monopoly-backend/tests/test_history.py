@@ -0,0 +1,28 @@
+from app import main
+
+def fine(client, amount=50):
+    client.post("/transfer", json={"from_player_id": 1, "amount": amount, "is_fine": True}).raise_for_status()
+
+def test_history_replays_past_state(client, add_player):
+    add_player("Alice")
+    fine(client)
+    first = main.game_state.next_transaction_id - 1
+    fine(client)
+    past = client.get("/game/state", params={"at": first}).json()
+    assert past["players"][0]["cash"] == 1450
+    assert past["at_transaction_id"] == first
+    assert client.get("/game/state").json()["players"][0]["cash"] == 1400
+
+def test_history_across_checkpoints(client, add_player):
+    add_player("Alice")
+    for i in range(2 * main.HISTORY_CHECKPOINT_INTERVAL + 5):
+        fine(client, 1 + i % 3)
+    transactions = main.game_state.transactions
+    for t in transactions[::17]:
+        expected = 1500 - sum(x.amount for x in transactions if x.id <= t.id)
+        assert client.get("/game/state", params={"at": t.id}).json()["players"][0]["cash"] == expected
+
+def test_history_unknown_transaction(client, add_player):
+    add_player("Alice")
+    fine(client)
+    assert client.get("/game/state", params={"at": 99}).status_code == 404
@@ -0,0 +1,43 @@
+import uuid
+
+from app import main
+
+def transfer(client, key, amount=50):
+    return client.post("/transfer", json={"from_player_id": 1, "amount": amount}, headers={"Idempotency-Key": key})
+
+def test_retry_replays_response_without_applying_twice(client, add_player):
+    add_player("Alice")
+    key = str(uuid.uuid4())
+    first = transfer(client, key)
+    retry = transfer(client, key)
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert main.game_state.players[1].cash == 1450
+
+def test_key_reused_for_different_request_is_rejected(client, add_player):
+    add_player("Alice")
+    key = str(uuid.uuid4())
+    transfer(client, key, amount=50)
+    assert transfer(client, key, amount=60).status_code == 422
+    assert main.game_state.players[1].cash == 1450
+
+def test_client_errors_are_replayed(client, add_player):
+    add_player("Alice")
+    key = str(uuid.uuid4())
+    assert transfer(client, key, amount=5000).status_code == 400
+    retry = transfer(client, key, amount=5000)
+    assert retry.status_code == 400
+    assert retry.headers["idempotent-replayed"] == "true"
+
+def test_rate_limited_request_is_not_cached(client, add_player, monkeypatch):
+    add_player("Alice")
+    key = str(uuid.uuid4())
+    monkeypatch.setattr(main.admission_controller, "game_bucket", main.TokenBucket(0.001, 0))
+    assert transfer(client, key).status_code == 429
+    monkeypatch.undo()
+
+    retry = transfer(client, key)
+    assert retry.status_code == 200
+    assert "idempotent-replayed" not in retry.headers
+    assert main.game_state.players[1].cash == 1450
@@ -0,0 +1,42 @@
+from app import main
+
+def buy(client, player_id, *property_ids):
+    for property_id in property_ids:
+        client.post("/properties/buy", json={"player_id": player_id, "property_id": property_id}).raise_for_status()
+
+def spend_down_to(client, player_id, amount):
+    excess = main.game_state.players[player_id].cash - amount
+    client.post("/transfer", json={"from_player_id": player_id, "amount": excess, "is_fine": True}).raise_for_status()
+
+def test_mortgages_before_selling(client, add_player):
+    alice = add_player("Alice")
+    buy(client, alice, "old_kent_road", "kings_cross_station")
+    spend_down_to(client, alice, 0)
+    plan = client.post("/liquidation/plan", json={"player_id": alice, "amount_owed": 100}).json()
+    assert plan["sufficient"]
+    assert [(a["action"], a["property_id"]) for a in plan["actions"]] == [("mortgage", "kings_cross_station")]
+
+    client.post("/liquidation/execute", json={"player_id": alice, "amount_owed": 100}).raise_for_status()
+    assert main.game_state.owned_properties["kings_cross_station"].is_mortgaged
+    assert main.game_state.players[alice].cash == 100
+
+def test_sells_fewest_buildings_evenly(client, add_player):
+    alice = add_player("Alice")
+    buy(client, alice, "old_kent_road", "whitechapel_road")
+    for prop_id in ("old_kent_road", "whitechapel_road"):
+        client.post("/properties/build", json={"player_id": alice, "property_id": prop_id}).raise_for_status()
+    spend_down_to(client, alice, 0)
+    # One house sold (£25) frees its property to be mortgaged (£30); two houses would be worse
+    plan = client.post("/liquidation/plan", json={"player_id": alice, "amount_owed": 40}).json()
+    assert [a["action"] for a in plan["actions"]] == ["sell_building", "mortgage"]
+    assert plan["actions"][0]["property_id"] == plan["actions"][1]["property_id"]
+    assert plan["cash_raised"] == 55
+
+def test_cannot_raise_enough(client, add_player):
+    alice = add_player("Alice")
+    buy(client, alice, "old_kent_road")
+    plan = client.post("/liquidation/plan", json={"player_id": alice, "amount_owed": 5000}).json()
+    assert not plan["sufficient"]
+    assert plan["shortfall"] == 5000 - 1440 - 60
+    assert client.post("/liquidation/execute", json={"player_id": alice, "amount_owed": 5000}).status_code == 400
+    assert main.game_state.property_owners["old_kent_road"] == alice
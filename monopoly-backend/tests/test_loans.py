@@ -0,0 +1,74 @@
+def take_loan(client, borrower, principal=1000, rate=10, lender=None):
+    body = {"borrower_id": borrower, "lender_id": lender, "principal": principal, "rate": rate, "due_in_turns": 10}
+    response = client.post("/loans", json=body)
+    response.raise_for_status()
+    return response.json()["loan"]["id"]
+
+def next_turns(client, count):
+    for _ in range(count):
+        client.post("/turn/next").raise_for_status()
+
+def owed(client, loan_id):
+    return {loan["id"]: loan for loan in client.get("/loans").json()["loans"]}[loan_id]
+
+def test_interest_accrues_on_principal_only(client, add_player):
+    alice = add_player("Alice")
+    loan_id = take_loan(client, alice)
+    next_turns(client, 2)
+    assert owed(client, loan_id)["owed"] == 1200
+
+    # Paying part of the interest must not turn the rest into principal
+    repayment = client.post(f"/loans/{loan_id}/repay", json={"amount": 50}).json()
+    assert repayment["interest"] == 50
+    assert repayment["remaining"] == 1150
+    next_turns(client, 1)
+    loan = owed(client, loan_id)
+    assert loan["balance"] == 1000
+    assert loan["interest_accrued"] == 250
+    assert loan["owed"] == 1250
+
+def test_repayment_pays_interest_before_principal(client, add_player):
+    alice = add_player("Alice")
+    loan_id = take_loan(client, alice)
+    next_turns(client, 1)
+    repayment = client.post(f"/loans/{loan_id}/repay", json={"amount": 600}).json()
+    assert repayment["interest"] == 100
+    assert repayment["remaining"] == 500
+    next_turns(client, 1)
+    assert owed(client, loan_id)["owed"] == 550
+
+def test_fractional_interest_is_not_lost_between_repayments(client, add_player):
+    alice = add_player("Alice")
+    loan_id = take_loan(client, alice, principal=10, rate=5)
+    # 0.5 a turn: nothing is owed after one turn, a pound after two, even with a repayment between
+    next_turns(client, 1)
+    assert owed(client, loan_id)["interest_accrued"] == 0
+    client.post(f"/loans/{loan_id}/repay", json={"amount": 1}).raise_for_status()
+    next_turns(client, 1)
+    loan = owed(client, loan_id)
+    assert loan["balance"] == 9
+    # 0.5 + 0.45
+    assert loan["interest_accrued"] == 0
+    next_turns(client, 1)
+    assert owed(client, loan_id)["interest_accrued"] == 1
+
+def test_full_repayment_closes_loan(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    loan_id = take_loan(client, alice, principal=200, rate=5, lender=bob)
+    next_turns(client, 2)
+    repayment = client.post(f"/loans/{loan_id}/repay", json={}).json()
+    assert repayment == {"loan_id": loan_id, "amount": 220, "interest": 20, "remaining": 0, "player_cash": 1480}
+    assert client.get("/loans").json()["loans"] == []
+    players = {p["id"]: p["cash"] for p in client.get("/game/state").json()["players"]}
+    assert players[bob] == 1520
+
+def test_player_with_loans_cannot_be_removed(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    loan_id = take_loan(client, alice, principal=100, rate=0, lender=bob)
+    for player in (alice, bob):
+        response = client.delete(f"/players/{player}")
+        assert response.status_code == 400
+    client.post(f"/loans/{loan_id}/repay", json={}).raise_for_status()
+    assert client.delete(f"/players/{alice}").status_code == 200
@@ -0,0 +1,43 @@
+from app import main
+
+def roll(client, player_id, dice, **extra):
+    return client.post("/turn/roll", json={"player_id": player_id, "dice": dice, **extra})
+
+def test_passing_go_and_paying_rent(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    client.post("/properties/buy", json={"player_id": bob, "property_id": "old_kent_road"}).raise_for_status()
+    main.game_state.positions[alice] = len(main.BOARD_SQUARES) - 1
+    result = roll(client, alice, [1, 1]).json()
+    assert (result["square"], result["passed_go"]) == ("old_kent_road", True)
+    assert result["landing"] == {"action": "rent_paid", "property_id": "old_kent_road",
+                                 "property_name": "Old Kent Road", "owner_id": bob, "amount": 2}
+    assert result["player_cash"] == 1500 + main.GO_SALARY - 2
+    assert main.game_state.players[bob].cash == 1440 + 2
+
+def test_tax_goes_to_free_parking(client, add_player):
+    alice = add_player("Alice")
+    result = roll(client, alice, [2, 2]).json()
+    assert result["square"] == "income_tax"
+    assert result["landing"] == {"action": "tax_paid", "amount": 200}
+    assert result["free_parking_pot"] == 200
+
+def test_go_to_jail(client, add_player):
+    alice = add_player("Alice")
+    main.game_state.positions[alice] = main.BOARD_SQUARES.index("go_to_jail") - 3
+    result = roll(client, alice, [1, 2]).json()
+    assert result["landing"]["action"] == "sent_to_jail"
+    assert result["position"] == main.JAIL_POSITION
+
+def test_turn_advances_unless_doubles(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    assert roll(client, bob, [1, 2]).status_code == 400
+    assert roll(client, alice, [3, 3], advance_turn=True).json()["current_turn_index"] == 0
+    assert roll(client, alice, [1, 2], advance_turn=True).json()["current_turn_index"] == 1
+
+def test_rejects_impossible_dice(client, add_player):
+    alice = add_player("Alice")
+    for dice in ([0, 3], [7, 1], [1, 2, 3]):
+        assert roll(client, alice, dice).status_code == 400
+    assert main.game_state.positions.get(alice, 0) == 0
@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+from app import main
+
+def failing_write():
+    raise OSError("disk full")
+
+def test_failed_write_keeps_mutations_pending(monkeypatch, caplog):
+    scheduler = main.SaveScheduler(interval=0, max_pending=1)
+    monkeypatch.setattr(main, "write_game_state", failing_write)
+    scheduler.mark_dirty()
+    assert scheduler.pending_mutations == 1
+    assert scheduler.flush_count == 0
+    assert "Failed to save game state" in caplog.text
+
+    monkeypatch.undo()
+    scheduler.flush()
+    assert scheduler.pending_mutations == 0
+    assert scheduler.flush_count == 1
+
+def test_background_task_survives_failed_write(monkeypatch):
+    attempts = []
+
+    def flaky_write():
+        attempts.append(1)
+        if len(attempts) == 1:
+            failing_write()
+
+    monkeypatch.setattr(main, "write_game_state", flaky_write)
+
+    async def scenario():
+        scheduler = main.SaveScheduler(interval=0.01, max_pending=100)
+        scheduler.start()
+        scheduler.mark_dirty()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if scheduler.flush_count:
+                break
+        assert not scheduler.task.done()
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert len(attempts) == 2
+    assert scheduler.flush_count == 1
+    assert scheduler.pending_mutations == 0
+
+def test_mutations_reach_save_file(client, add_player):
+    add_player("Alice")
+    main.save_scheduler.flush()
+    with open(main.SAVE_FILE, "rb") as f:
+        saved = json.load(f)
+    assert [p["name"] for p in saved["players"].values()] == ["Alice"]
+
+def test_background_flush_is_timed_separately(monkeypatch):
+    profiler = main.RequestProfiler(slow_threshold_ms=1000, log_size=10)
+    monkeypatch.setattr(main, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(main, "request_profiler", profiler)
+    monkeypatch.setattr(main, "write_game_state", lambda: None)
+    scheduler = main.SaveScheduler(interval=0, max_pending=1)
+
+    scheduler.mark_dirty()
+    # A write-through inside a request is covered by that request's persistence span
+    token = main.request_spans.set({})
+    try:
+        scheduler.mark_dirty()
+    finally:
+        main.request_spans.reset(token)
+
+    background = profiler.stats()["background_ms"]
+    assert list(background) == ["save"]
+    assert background["save"]["count"] == 1
+    assert profiler.request_count == 0
@@ -0,0 +1,65 @@
+from app import main
+
+def schedule(client, **payment):
+    response = client.post("/scheduled-payments", json=payment)
+    response.raise_for_status()
+    return response.json()["payment"]["id"]
+
+def next_turns(client, count):
+    fired = []
+    for _ in range(count):
+        response = client.post("/turn/next")
+        response.raise_for_status()
+        fired.extend(response.json()["scheduled_payments"])
+    return fired
+
+def test_payment_every_n_turns(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    schedule(client, from_player_id=alice, to_player_id=bob, amount=10, every=2)
+    fired = next_turns(client, 5)
+    assert [p["status"] for p in fired] == ["paid", "paid"]
+    assert main.game_state.players[bob].cash == 1520
+
+def test_salary_each_round(client, add_player):
+    alice = add_player("Alice")
+    add_player("Bob")
+    add_player("Carol")
+    schedule(client, to_player_id=alice, amount=200, unit="round")
+    assert next_turns(client, 2) == []
+    # Play comes back round to the first player
+    assert [p["amount"] for p in next_turns(client, 1)] == [200]
+    assert main.game_state.players[alice].cash == 1700
+
+def test_limited_occurrences_then_removed(client, add_player):
+    alice = add_player("Alice")
+    add_player("Bob")
+    schedule(client, from_player_id=alice, is_fine=True, amount=50, occurrences=2)
+    assert len(next_turns(client, 4)) == 2
+    assert client.get("/scheduled-payments").json()["payments"] == []
+    assert main.game_state.free_parking_pot == 100
+
+def test_unaffordable_payment_becomes_debt(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    schedule(client, from_player_id=alice, to_player_id=bob, amount=2000)
+    [fired] = next_turns(client, 1)
+    assert fired["status"] == "owed"
+    [debt] = client.get("/debts").json()["debts"]
+    assert (debt["id"], debt["amount"]) == (fired["debt_id"], 2000)
+    assert main.game_state.players[alice].cash == 1500
+
+def test_cancelled_payment_never_fires(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    payment_id = schedule(client, from_player_id=alice, to_player_id=bob, amount=10)
+    client.delete(f"/scheduled-payments/{payment_id}").raise_for_status()
+    assert next_turns(client, 3) == []
+
+def test_old_saves_load_laps_as_rounds():
+    state = main.GameState()
+    payment = {"id": 1, "to_player_id": 1, "amount": 200, "unit": "lap", "every": 1, "next_due": 4}
+    main.apply_snapshot(state, {"lap_count": 3, "scheduled_payments": {"1": payment}})
+    assert state.round_count == 3
+    assert state.scheduled_payments[1].unit == "round"
+    assert state.payment_queues["round"] == [(4, 1)]
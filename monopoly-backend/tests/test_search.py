@@ -0,0 +1,36 @@
+def fine(client, player_id, amount):
+    client.post("/transfer", json={"from_player_id": player_id, "amount": amount, "is_fine": True}).raise_for_status()
+
+def search(client, **params):
+    return client.get("/transactions/search", params=params).json()
+
+def test_filters_combine(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    client.post("/properties/buy", json={"player_id": alice, "property_id": "old_kent_road"}).raise_for_status()
+    fine(client, alice, 50)
+    fine(client, bob, 75)
+    assert search(client, entity="Alice")["total"] == 2
+    assert [t["amount"] for t in search(client, type="fine", min_amount=60)["transactions"]] == [75]
+    assert [t["property_id"] for t in search(client, q="old kent")["transactions"]] == ["old_kent_road"]
+    assert search(client, entity="Alice", type="fine", max_amount=40)["total"] == 0
+
+def test_pages_newest_first(client, add_player):
+    alice = add_player("Alice")
+    for amount in range(1, 6):
+        fine(client, alice, amount)
+    page = search(client, type="fine", limit=2)
+    assert [t["amount"] for t in page["transactions"]] == [4, 5]
+    older = search(client, type="fine", limit=2, before=page["next_cursor"])
+    assert [t["amount"] for t in older["transactions"]] == [2, 3]
+    assert search(client, type="fine", limit=2, before=older["next_cursor"])["next_cursor"] is None
+
+def test_search_after_reset_finds_nothing_old(client, add_player):
+    alice = add_player("Alice")
+    fine(client, alice, 10)
+    client.post("/game/reset").raise_for_status()
+    assert search(client, type="fine")["total"] == 0
+
+def test_bad_limit_and_time(client):
+    assert client.get("/transactions/search", params={"limit": 0}).status_code == 400
+    assert client.get("/transactions/search", params={"since": "yesterday"}).status_code == 400
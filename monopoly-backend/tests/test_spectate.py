@@ -0,0 +1,65 @@
+from app import main
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+def fine(client, player_id, amount=10):
+    client.post("/transfer", json={"from_player_id": player_id, "amount": amount, "is_fine": True}).raise_for_status()
+
+def test_unchanged_state_is_not_modified(client, add_player):
+    add_player("Alice")
+    first = client.get("/spectate/state")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+    again = client.get("/spectate/state", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+
+def test_commit_invalidates_etag(client, add_player):
+    alice = add_player("Alice")
+    for path in ("/spectate/state", "/spectate/standings"):
+        etag = client.get(path).headers["etag"]
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+        fine(client, alice)
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+def test_standings_reflect_latest_commit(client, add_player):
+    alice = add_player("Alice")
+    add_player("Bob")
+    fine(client, alice, 100)
+    standings = client.get("/spectate/standings").json()
+    assert [s["name"] for s in standings["standings"]] == ["Bob", "Alice"]
+    assert standings["free_parking_pot"] == 100
+
+def test_snapshot_built_once_per_commit(client, add_player):
+    alice = add_player("Alice")
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"players": [p.name for p in main.game_state.players.values()]}
+
+    first = main.spectator_feed.snapshot("test", build)
+    assert main.spectator_feed.snapshot("test", build) is first
+    fine(client, alice)
+    assert main.spectator_feed.snapshot("test", build) is not first
+    assert len(builds) == 2
+
+def test_precompressed_body_is_served(client, add_player):
+    # Enough owned properties that the state crosses the compression threshold
+    for i, name in enumerate(("Alice", "Bob", "Carol")):
+        player = add_player(name)
+        for prop_id in list(main.PROPERTIES_DATA)[i * 5:i * 5 + 5]:
+            client.post("/properties/buy", json={"player_id": player, "property_id": prop_id}).raise_for_status()
+    response = client.get("/spectate/state", headers=GZIP)
+    snapshot = main.spectator_feed.snapshots["state"]
+    assert "gzip" in snapshot.bodies
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) == len(snapshot.bodies["gzip"])
+    assert response.content == snapshot.bodies["identity"]
+
+    plain = client.get("/spectate/state", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == response.headers["etag"]
@@ -0,0 +1,46 @@
+def current_revision(client):
+    return client.get("/game/state").json()["revision"]
+
+def fine(client, revision=None, amount=50):
+    params = {"return": "delta"}
+    if revision is not None:
+        params["revision"] = revision
+    return client.post("/transfer", params=params, json={"from_player_id": 1, "amount": amount, "is_fine": True})
+
+def test_delta_for_up_to_date_client(client, add_player):
+    add_player("Alice")
+    revision = current_revision(client)
+    data = fine(client, revision).json()
+    assert data["state_delta"] == {
+        "players": [{"id": 1, "name": "Alice", "cash": 1450, "properties": []}],
+        "free_parking_pot": 50,
+    }
+    assert [t["amount"] for t in data["new_transactions"]] == [50]
+    assert data["revision"] == current_revision(client) != revision
+
+def test_stale_client_is_told_to_refetch(client, add_player):
+    add_player("Alice")
+    revision = current_revision(client)
+    # Another device changes the game first
+    client.post("/transfer", json={"from_player_id": 1, "amount": 10, "is_fine": True}).raise_for_status()
+    data = fine(client, revision).json()
+    assert data["state_stale"] is True
+    assert "state_delta" not in data and "new_transactions" not in data
+    assert data["revision"] == current_revision(client)
+
+def test_client_without_revision_is_stale(client, add_player):
+    add_player("Alice")
+    assert fine(client).json()["state_stale"] is True
+
+def test_reset_replaces_transaction_log(client, add_player):
+    add_player("Alice")
+    fine(client).raise_for_status()
+    data = client.post("/game/reset", params={"return": "delta", "revision": current_revision(client)}).json()
+    assert data["transactions_replaced"] is True
+    assert data["new_transactions"] == []
+
+def test_failed_mutation_is_not_augmented(client, add_player):
+    add_player("Alice")
+    response = fine(client, current_revision(client), amount=10000)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Insufficient funds"}
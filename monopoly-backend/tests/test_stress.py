@@ -0,0 +1,221 @@
+"""Concurrency stress harness.
+
+Fires batches of concurrent, interleaved requests at the ASGI app and checks the game's
+invariants after every batch:
+
+- money is conserved: player cash plus the Free Parking pot only changes by what the bank
+  paid out or took in, as implied by each successful request
+- property_owners and owned_properties describe the same properties, owned by existing
+  players, and every house and hotel is either on the board or in the bank
+- turn_order is a permutation of the players and current_turn_index points into it
+
+Run as a test (``pytest tests/test_stress.py``) or on its own for a throughput report::
+
+    python -m tests.test_stress --batches 20 --batch-size 500 --players 6
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+# Configure the app for load before it is imported: no rate limiting, and a scratch save file
+os.environ.setdefault("SAVE_FILE", os.path.join(tempfile.mkdtemp(), "game_state.json"))
+for name in ("RATE_LIMIT_GAME_PER_SECOND", "RATE_LIMIT_GAME_BURST",
+             "RATE_LIMIT_CLIENT_PER_SECOND", "RATE_LIMIT_CLIENT_BURST", "MAX_PENDING_REQUESTS"):
+    os.environ.setdefault(name, "1000000000")
+
+import httpx
+
+from app import main
+
+# An operation is a request plus how much the bank takes in (positive) or pays out
+# (negative) when it succeeds, worked out from the request and its response
+BankDelta = Callable[[dict], int]
+
+@dataclass
+class Operation:
+    method: str
+    path: str
+    body: Optional[dict] = None
+    bank_delta: BankDelta = lambda response: 0
+
+@dataclass
+class BatchReport:
+    operations: int
+    seconds: float
+    statuses: dict = field(default_factory=dict)
+    latencies_ms: list = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.operations / self.seconds if self.seconds else 0.0
+
+class InvariantViolation(AssertionError):
+    pass
+
+def random_operation(rng: random.Random, player_ids: list[int]) -> Operation:
+    player = rng.choice(player_ids)
+    other = rng.choice(player_ids)
+    prop_id = rng.choice(list(main.PROPERTIES_DATA))
+    prop = main.PROPERTIES_DATA[prop_id]
+    amount = rng.randint(1, 300)
+    choice = rng.randrange(20)
+    if choice == 0:
+        return Operation("POST", "/transfer", {"from_player_id": player, "to_player_id": other, "amount": amount})
+    if choice == 1:
+        return Operation("POST", "/transfer", {"from_player_id": player, "amount": amount}, lambda r: amount)
+    if choice == 2:
+        return Operation("POST", "/transfer", {"to_player_id": player, "amount": amount}, lambda r: -amount)
+    if choice == 3:
+        return Operation("POST", "/transfer", {"from_player_id": player, "amount": amount, "is_fine": True})
+    if choice in (4, 5):
+        return Operation("POST", "/properties/buy", {"player_id": player, "property_id": prop_id},
+                         lambda r: prop["purchase_cost"])
+    if choice == 6:
+        return Operation("POST", "/properties/mortgage", {"player_id": player, "property_id": prop_id},
+                         lambda r: -prop["mortgage_value"])
+    if choice == 7:
+        return Operation("POST", "/properties/unmortgage", {"player_id": player, "property_id": prop_id},
+                         lambda r: r["cost"])
+    if choice in (8, 9):
+        return Operation("POST", "/properties/build", {"player_id": player, "property_id": prop_id},
+                         lambda r: prop.get("house_cost") or 0)
+    if choice == 10:
+        return Operation("POST", "/properties/sell-building", {"player_id": player, "property_id": prop_id},
+                         lambda r: -((prop.get("house_cost") or 0) // 2))
+    if choice == 11:
+        return Operation("POST", "/properties/sell", {"player_id": player, "property_id": prop_id},
+                         lambda r: -r["sale_value"])
+    if choice == 12:
+        return Operation("POST", "/properties/transfer", {
+            "from_player_id": player, "to_player_id": other, "property_id": prop_id, "sale_price": amount,
+        })
+    if choice == 13:
+        return Operation("POST", "/rent/pay", {"from_player_id": player, "property_id": prop_id,
+                                               "dice_roll": rng.randint(2, 12)})
+    if choice == 14:
+        return Operation("POST", "/free-parking/collect", {"player_id": player})
+    if choice == 15:
+        return Operation("POST", "/receive-from-all", {"player_id": player, "amount": rng.randint(1, 50)})
+    if choice == 16:
+        return Operation("POST", "/turn/roll", {"player_id": player, "advance_turn": rng.random() < 0.5},
+                         lambda r: -main.GO_SALARY if r["passed_go"] else 0)
+    if choice == 17:
+        return Operation("POST", "/turn/next")
+    if choice == 18:
+        shuffled = player_ids[:]
+        rng.shuffle(shuffled)
+        return Operation("POST", "/turn/reorder", {"turn_order": shuffled})
+    return Operation("GET", rng.choice(["/game/state", "/transactions?limit=50"]))
+
+def check_invariants(expected_money: int):
+    state = main.game_state
+    errors = []
+
+    money = sum(p.cash for p in state.players.values()) + state.free_parking_pot
+    if money != expected_money:
+        errors.append(f"money not conserved: players and Free Parking hold {money}, expected {expected_money}")
+    errors += [f"player {p.id} has negative cash {p.cash}" for p in state.players.values() if p.cash < 0]
+    if state.free_parking_pot < 0:
+        errors.append(f"negative Free Parking pot {state.free_parking_pot}")
+
+    if set(state.property_owners) != set(state.owned_properties):
+        errors.append("property_owners and owned_properties list different properties")
+    for prop_id, owner in state.property_owners.items():
+        if owner not in state.players:
+            errors.append(f"{prop_id} is owned by missing player {owner}")
+        owned = state.owned_properties.get(prop_id)
+        if owned is not None and owned.property_id != prop_id:
+            errors.append(f"owned_properties[{prop_id}] describes {owned.property_id}")
+        if owned is not None and owned.is_mortgaged and (owned.houses or owned.has_hotel):
+            errors.append(f"{prop_id} is mortgaged with buildings on it")
+    houses = sum(p.houses for p in state.owned_properties.values())
+    hotels = sum(1 for p in state.owned_properties.values() if p.has_hotel)
+    if houses + state.bank_houses != main.BANK_HOUSES or hotels + state.bank_hotels != main.BANK_HOTELS:
+        errors.append(f"buildings not conserved: {houses}+{state.bank_houses} houses, {hotels}+{state.bank_hotels} hotels")
+
+    if sorted(state.turn_order) != sorted(state.players):
+        errors.append(f"turn_order {state.turn_order} does not match players {sorted(state.players)}")
+    if state.turn_order and not 0 <= state.current_turn_index < len(state.turn_order):
+        errors.append(f"current_turn_index {state.current_turn_index} is out of range")
+
+    if errors:
+        raise InvariantViolation("; ".join(errors))
+
+async def run_batch(client: httpx.AsyncClient, operations: list[Operation]) -> tuple[BatchReport, int]:
+    latencies = []
+    statuses: dict[int, int] = {}
+    bank_taken = 0
+
+    async def send(operation: Operation):
+        nonlocal bank_taken
+        start = time.perf_counter()
+        response = await client.request(operation.method, operation.path, json=operation.body)
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if response.status_code >= 500:
+            raise AssertionError(f"{operation.method} {operation.path} failed with {response.status_code}: {response.text}")
+        if response.is_success and operation.method != "GET":
+            bank_taken += operation.bank_delta(response.json())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(operation) for operation in operations))
+    return BatchReport(len(operations), time.perf_counter() - start, statuses, latencies), bank_taken
+
+async def run_stress(batches: int, batch_size: int, players: int, seed: int,
+                     report: Callable[[str], None] = lambda line: None) -> list[BatchReport]:
+    rng = random.Random(seed)
+    reports = []
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.lifespan(main.app), httpx.AsyncClient(transport=transport, base_url="http://stress") as client:
+        (await client.post("/game/reset")).raise_for_status()
+        for i in range(players):
+            (await client.post("/players", json={"name": f"Player {i + 1}"})).raise_for_status()
+        player_ids = list(main.game_state.players)
+        expected_money = sum(p.cash for p in main.game_state.players.values()) + main.game_state.free_parking_pot
+        check_invariants(expected_money)
+
+        for batch in range(batches):
+            operations = [random_operation(rng, player_ids) for _ in range(batch_size)]
+            batch_report, bank_taken = await run_batch(client, operations)
+            expected_money -= bank_taken
+            check_invariants(expected_money)
+            reports.append(batch_report)
+            statuses = ", ".join(f"{code}: {count}" for code, count in sorted(batch_report.statuses.items()))
+            report(f"batch {batch + 1}/{batches}: {batch_report.throughput:,.0f} ops/s ({statuses})")
+    return reports
+
+def summarize(reports: list[BatchReport]) -> str:
+    operations = sum(r.operations for r in reports)
+    seconds = sum(r.seconds for r in reports)
+    latencies = sorted(ms for r in reports for ms in r.latencies_ms)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (f"{operations} operations in {seconds:.2f}s: {operations / seconds:,.0f} ops/s, "
+            f"latency p50 {statistics.median(latencies):.2f}ms p99 {p99:.2f}ms; invariants held after every batch")
+
+def test_concurrent_operations_preserve_invariants():
+    reports = asyncio.run(run_stress(batches=5, batch_size=200, players=4, seed=1))
+    assert sum(r.operations for r in reports) == 1000
+
+def main_cli(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Stress the API with concurrent requests and check game invariants")
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    try:
+        reports = asyncio.run(run_stress(args.batches, args.batch_size, args.players, args.seed, report=print))
+    except InvariantViolation as e:
+        print(f"Invariant violated: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(summarize(reports))
+
+if __name__ == "__main__":
+    main_cli()
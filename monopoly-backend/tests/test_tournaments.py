@@ -0,0 +1,41 @@
+import asyncio
+
+from app import main
+
+def test_standings_reports_skip_the_game_bucket(client, monkeypatch):
+    monkeypatch.setattr(main.admission_controller, "game_bucket", main.TokenBucket(0.001, 0))
+    tournament = client.post("/tournaments", json={"name": "Cup"}).json()["tournament"]
+    table = client.post(f"/tournaments/{tournament['id']}/tables", json={"name": "Table 1"}).json()
+    report = {"players": [{"player_id": 1, "name": "Alice", "cash": 1500, "net_worth": 1700}]}
+    assert client.post(table["report_path"], json=report).status_code == 200
+    leaderboard = client.get(f"/tournaments/{tournament['id']}/leaderboard").json()["leaderboard"]
+    assert [entry["name"] for entry in leaderboard] == ["Alice"]
+    # The table's own game is still limited
+    assert client.post("/players", json={"name": "Bob"}).status_code == 429
+
+def test_reporter_keeps_running_after_unexpected_error(monkeypatch, caplog):
+    calls = []
+
+    def flaky_post(url, payload):
+        calls.append(payload)
+        if len(calls) == 1:
+            raise ValueError("unknown url type")
+
+    monkeypatch.setattr(main, "post_json", flaky_post)
+    monkeypatch.setattr(main, "TOURNAMENT_REPORT_MIN_INTERVAL_SECONDS", 0.01)
+
+    async def scenario():
+        reporter = main.StandingsReporter("http://tournament.invalid/report")
+        reporter.start()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if reporter.last_sent is not None:
+                break
+        assert not reporter.task.done()
+        await reporter.stop()
+        return reporter
+
+    reporter = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert reporter.last_sent is not None
+    assert "Failed to report standings" in caplog.text
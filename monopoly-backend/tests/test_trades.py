@@ -0,0 +1,58 @@
+from app import main
+
+def buy(client, player_id, property_id):
+    client.post("/properties/buy", json={"player_id": player_id, "property_id": property_id}).raise_for_status()
+
+def cash(player_id):
+    return main.game_state.players[player_id].cash
+
+def test_trade_swaps_property_for_cash(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    buy(client, alice, "old_kent_road")
+    trade = {"proposer": {"player_id": alice, "property_ids": ["old_kent_road"]},
+             "counterparty": {"player_id": bob, "cash": 100}}
+    client.post("/trades", json=trade).raise_for_status()
+    assert main.game_state.property_owners["old_kent_road"] == bob
+    assert (cash(alice), cash(bob)) == (1540, 1400)
+
+def test_receiving_mortgaged_property_costs_interest_or_unmortgage(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    buy(client, alice, "old_kent_road")
+    buy(client, alice, "whitechapel_road")
+    for prop_id in ("old_kent_road", "whitechapel_road"):
+        client.post("/properties/mortgage", json={"player_id": alice, "property_id": prop_id}).raise_for_status()
+    trade = {"proposer": {"player_id": alice, "property_ids": ["old_kent_road", "whitechapel_road"]},
+             "counterparty": {"player_id": bob, "unmortgage_property_ids": ["whitechapel_road"]}}
+    result = client.post("/trades", json=trade).json()
+    # 10% interest on Old Kent Road, 110% of the mortgage to lift Whitechapel Road's
+    assert result["mortgage_fees"] == {str(alice): 0, str(bob): 3 + 33}
+    assert main.game_state.owned_properties["old_kent_road"].is_mortgaged
+    assert not main.game_state.owned_properties["whitechapel_road"].is_mortgaged
+
+def test_unaffordable_trade_changes_nothing(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    buy(client, alice, "old_kent_road")
+    trade = {"proposer": {"player_id": alice, "property_ids": ["old_kent_road"]},
+             "counterparty": {"player_id": bob, "cash": 2000}}
+    assert client.post("/trades", json=trade).status_code == 400
+    assert main.game_state.property_owners["old_kent_road"] == alice
+    assert (cash(alice), cash(bob)) == (1440, 1500)
+
+def test_proposal_is_checked_again_on_accept(client, add_player):
+    alice = add_player("Alice")
+    bob = add_player("Bob")
+    buy(client, alice, "old_kent_road")
+    trade = {"proposer": {"player_id": alice, "property_ids": ["old_kent_road"]},
+             "counterparty": {"player_id": bob, "cash": 100}}
+    trade_id = client.post("/trades/propose", json=trade).json()["trade"]["id"]
+    assert client.post(f"/trades/{trade_id}/accept", json={"player_id": alice}).status_code == 400
+
+    # Bob can no longer pay by the time he accepts
+    client.post("/transfer", json={"from_player_id": bob, "amount": 1450, "is_fine": True}).raise_for_status()
+    assert client.post(f"/trades/{trade_id}/accept", json={"player_id": bob}).status_code == 400
+    declined = client.post(f"/trades/{trade_id}/decline", json={"player_id": bob}).json()
+    assert declined["trade"]["status"] == "declined"
+    assert main.game_state.property_owners["old_kent_road"] == alice
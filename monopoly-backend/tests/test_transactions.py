@@ -0,0 +1,47 @@
+def fine(client, player_id, amount):
+    client.post("/transfer", json={"from_player_id": player_id, "amount": amount, "is_fine": True}).raise_for_status()
+
+def amounts(page):
+    return [t["amount"] for t in page["transactions"]]
+
+def test_pages_back_from_newest(client, add_player):
+    alice = add_player("Alice")
+    for amount in range(1, 6):
+        fine(client, alice, amount)
+    page = client.get("/transactions", params={"limit": 2}).json()
+    assert amounts(page) == [4, 5]
+    older = client.get("/transactions", params={"limit": 2, "before": page["next_cursor"]}).json()
+    assert amounts(older) == [2, 3]
+
+def test_after_cursor_returns_only_newer(client, add_player):
+    alice = add_player("Alice")
+    fine(client, alice, 1)
+    page = client.get("/transactions", params={"limit": 10}).json()
+    last_id = page["transactions"][-1]["id"]
+    for amount in range(2, 6):
+        fine(client, alice, amount)
+
+    newer = client.get("/transactions", params={"after": last_id, "log_id": page["log_id"], "limit": 3}).json()
+    assert amounts(newer) == [2, 3, 4]
+    assert newer["has_more"] and not newer["replaced"]
+    rest = client.get("/transactions", params={"after": newer["transactions"][-1]["id"], "log_id": page["log_id"], "limit": 3}).json()
+    assert amounts(rest) == [5]
+    assert not rest["has_more"]
+
+def test_after_cursor_on_reset_log_replaces(client, add_player):
+    alice = add_player("Alice")
+    fine(client, alice, 1)
+    page = client.get("/transactions", params={"limit": 10}).json()
+    client.post("/game/reset").raise_for_status()
+    bob = add_player("Bob")
+    for amount in (7, 8):
+        fine(client, bob, amount)
+
+    # Ids restarted, so id 1 now belongs to a different transaction
+    newer = client.get("/transactions", params={"after": 1, "log_id": page["log_id"], "limit": 10}).json()
+    assert newer["replaced"]
+    assert amounts(newer) == [7, 8]
+    assert newer["log_id"] != page["log_id"]
+
+def test_before_and_after_together_rejected(client):
+    assert client.get("/transactions", params={"before": 5, "after": 1}).status_code == 400
@@ -1,4 +1,5 @@
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect, useCallback, useRef } from 'react'
+import type { UIEvent } from 'react'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
@@ -10,6 +11,17 @@ import { Users, Building2, Train, Zap, ParkingCircle, Banknote, Home, Hotel, Ref
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 
+const MAX_REQUEST_RETRIES = 2
+
+// Other devices change the game too; this often, check whether our copy is out of date
+const STATE_POLL_INTERVAL_MS = 3000
+
+// The history panel loads the log a page at a time and renders only the rows in view
+const TRANSACTION_PAGE_SIZE = 100
+const TRANSACTION_ROW_HEIGHT = 41
+const TRANSACTION_VIEWPORT_HEIGHT = 400
+const TRANSACTION_OVERSCAN_ROWS = 10
+
 const DEFAULT_PREDEFINED_AMOUNTS = [10, 15, 50, 100, 200]
 
 function loadPredefinedAmounts(): number[] {
@@ -27,6 +39,16 @@ function loadPredefinedAmounts(): number[] {
     return DEFAULT_PREDEFINED_AMOUNTS
 }
 
+// crypto.randomUUID only exists in secure contexts, and phones often load the UI over plain
+// http from the LAN, so fall back to getRandomValues (available everywhere) to build the key
+function newIdempotencyKey(): string {
+  if (typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID()
+  }
+  const bytes = crypto.getRandomValues(new Uint8Array(16))
+  return Array.from(bytes, b => b.toString(16).padStart(2, '0')).join('')
+}
+
 function savePredefinedAmounts(amounts: number[]) {
   localStorage.setItem('monopoly_predefined_amounts', JSON.stringify(amounts))
 }
@@ -60,6 +82,7 @@ interface Transaction {
   to_entity: string
   amount: number
   description: string
+  property_id?: string | null
 }
 
 interface GameState {
@@ -70,6 +93,10 @@ interface GameState {
   versions: string[]
   turn_order: number[]
   current_turn_index: number
+  bank_houses?: number
+  bank_hotels?: number
+  positions?: Record<number, number>
+  revision?: string
 }
 
 const COLOR_MAP: Record<string, string> = {
@@ -145,6 +172,79 @@ const COLOR_GROUPS: Record<string, string[]> = {
   dark_blue: ['park_lane', 'mayfair'],
 }
 
+interface TransactionHistoryProps {
+  transactions: Transaction[]
+  hasOlder: boolean
+  loadingOlder: boolean
+  onLoadOlder: () => void
+}
+
+function TransactionHistory({ transactions, hasOlder, loadingOlder, onLoadOlder }: TransactionHistoryProps) {
+  const [scrollTop, setScrollTop] = useState(0)
+
+  // Rows are shown newest first, so row i is transactions[transactions.length - 1 - i]
+  const firstRow = Math.max(0, Math.floor(scrollTop / TRANSACTION_ROW_HEIGHT) - TRANSACTION_OVERSCAN_ROWS)
+  const lastRow = Math.min(
+    transactions.length,
+    Math.ceil((scrollTop + TRANSACTION_VIEWPORT_HEIGHT) / TRANSACTION_ROW_HEIGHT) + TRANSACTION_OVERSCAN_ROWS
+  )
+  const visible: Transaction[] = []
+  for (let row = firstRow; row < lastRow; row++) {
+    visible.push(transactions[transactions.length - 1 - row])
+  }
+
+  const handleScroll = (e: UIEvent<HTMLDivElement>) => {
+    const target = e.currentTarget
+    setScrollTop(target.scrollTop)
+    const nearBottom = target.scrollTop + target.clientHeight >= target.scrollHeight - TRANSACTION_ROW_HEIGHT * TRANSACTION_OVERSCAN_ROWS
+    if (nearBottom && hasOlder && !loadingOlder) {
+      onLoadOlder()
+    }
+  }
+
+  return (
+    <div className="overflow-auto" style={{ maxHeight: TRANSACTION_VIEWPORT_HEIGHT }} onScroll={handleScroll}>
+      <table className="w-full text-sm">
+        <thead className="sticky top-0 bg-white">
+          <tr className="border-b">
+            <th className="text-left p-2">Time</th>
+            <th className="text-left p-2">Type</th>
+            <th className="text-left p-2">From</th>
+            <th className="text-left p-2">To</th>
+            <th className="text-right p-2">Amount</th>
+            <th className="text-left p-2">Description</th>
+          </tr>
+        </thead>
+        <tbody>
+          {firstRow > 0 && <tr style={{ height: firstRow * TRANSACTION_ROW_HEIGHT }} />}
+          {visible.map(t => (
+            <tr key={t.id} className="border-b hover:bg-gray-50" style={{ height: TRANSACTION_ROW_HEIGHT }}>
+              <td className="p-2 text-gray-500 whitespace-nowrap">
+                {new Date(t.timestamp).toLocaleTimeString()}
+              </td>
+              <td className="p-2">
+                <Badge variant="outline" className="text-xs whitespace-nowrap">
+                  {t.type}
+                </Badge>
+              </td>
+              <td className="p-2 whitespace-nowrap">{t.from_entity}</td>
+              <td className="p-2 whitespace-nowrap">{t.to_entity}</td>
+              <td className="p-2 text-right font-medium text-green-600">£{t.amount}</td>
+              <td className="p-2 text-gray-600 whitespace-nowrap">{t.description}</td>
+            </tr>
+          ))}
+          {lastRow < transactions.length && (
+            <tr style={{ height: (transactions.length - lastRow) * TRANSACTION_ROW_HEIGHT }} />
+          )}
+        </tbody>
+      </table>
+      {loadingOlder && (
+        <p className="text-center text-gray-500 text-sm p-2">Loading older transactions...</p>
+      )}
+    </div>
+  )
+}
+
 function App() {
   const [gameState, setGameState] = useState<GameState | null>(null)
   const [newPlayerName, setNewPlayerName] = useState('')
@@ -177,6 +277,13 @@ function App() {
     const [receiveAllPlayerId, setReceiveAllPlayerId] = useState<number | null>(null)
     const [receiveAllAmount, setReceiveAllAmount] = useState('')
     const [transactions, setTransactions] = useState<Transaction[]>([])
+    const [transactionsCursor, setTransactionsCursor] = useState<number | null>(null)
+    const [loadingOlderTransactions, setLoadingOlderTransactions] = useState(false)
+    // Revision of the state we hold; the server only sends deltas against the latest one
+    const revisionRef = useRef<string | null>(null)
+    // Which transaction log we hold and the newest id in it, so updates only fetch what is new
+    const logIdRef = useRef<string | null>(null)
+    const lastTransactionIdRef = useRef<number | null>(null)
   
     const [configDialogOpen, setConfigDialogOpen] = useState(false)
     const [predefinedAmounts, setPredefinedAmounts] = useState<number[]>(loadPredefinedAmounts)
@@ -187,39 +294,132 @@ function App() {
     const [actionsTargetPlayer, setActionsTargetPlayer] = useState<string>('')
     const [payFineAmount, setPayFineAmount] = useState('')
 
+  const replaceTransactions = useCallback((page: { transactions?: Transaction[], next_cursor?: number | null, log_id?: string }) => {
+    const list = page.transactions || []
+    setTransactions(list)
+    setTransactionsCursor(page.next_cursor ?? null)
+    logIdRef.current = page.log_id ?? null
+    lastTransactionIdRef.current = list.length > 0 ? list[list.length - 1].id : 0
+  }, [])
+
+  const appendTransactions = useCallback((list: Transaction[]) => {
+    if (list.length === 0) return
+    // A poll and a mutation response may both deliver the same entries
+    setTransactions(prev => {
+      const lastId = prev.length > 0 ? prev[prev.length - 1].id : 0
+      return [...prev, ...list.filter(t => t.id > lastId)]
+    })
+    lastTransactionIdRef.current = Math.max(lastTransactionIdRef.current ?? 0, list[list.length - 1].id)
+  }, [])
+
+  const syncTransactions = useCallback(async () => {
+    // Catches up from the newest transaction we hold, so older pages already loaded stay put;
+    // only a reset log is replaced wholesale
+    if (logIdRef.current === null || lastTransactionIdRef.current === null) {
+      const response = await fetch(`${API_URL}/transactions?limit=${TRANSACTION_PAGE_SIZE}`)
+      replaceTransactions(await response.json())
+      return
+    }
+    for (;;) {
+      const logId = encodeURIComponent(logIdRef.current ?? '')
+      const response = await fetch(`${API_URL}/transactions?after=${lastTransactionIdRef.current}&log_id=${logId}&limit=${TRANSACTION_PAGE_SIZE}`)
+      const data = await response.json()
+      if (data.replaced) {
+        replaceTransactions(data)
+        return
+      }
+      appendTransactions(data.transactions || [])
+      if (!data.has_more) return
+    }
+  }, [replaceTransactions, appendTransactions])
+
     const fetchGameState= useCallback(async () => {
     try {
-      const [stateResponse, transactionsResponse] = await Promise.all([
+      const [stateResponse] = await Promise.all([
         fetch(`${API_URL}/game/state`),
-        fetch(`${API_URL}/transactions`)
+        syncTransactions()
       ])
       const stateData = await stateResponse.json()
-      const transactionsData = await transactionsResponse.json()
       setGameState(stateData)
-      setTransactions(transactionsData.transactions || [])
+      revisionRef.current = stateData.revision ?? null
       setError(null)
       } catch {
         setError('Failed to fetch game state')
       }
-    }, [])
+    }, [syncTransactions])
+
+  const loadOlderTransactions = useCallback(async () => {
+    if (transactionsCursor === null) return
+    setLoadingOlderTransactions(true)
+    try {
+      const response = await fetch(`${API_URL}/transactions?before=${transactionsCursor}&limit=${TRANSACTION_PAGE_SIZE}`)
+      const data = await response.json()
+      setTransactions(prev => [...(data.transactions || []), ...prev])
+      setTransactionsCursor(data.next_cursor ?? null)
+    } catch {
+      setError('Failed to load older transactions')
+    } finally {
+      setLoadingOlderTransactions(false)
+    }
+  }, [transactionsCursor])
 
   useEffect(() => {
     fetchGameState()
   }, [fetchGameState])
 
+  useEffect(() => {
+    const timer = setInterval(async () => {
+      try {
+        const response = await fetch(`${API_URL}/game/revision`)
+        const data = await response.json()
+        if (data.revision !== revisionRef.current) {
+          await fetchGameState()
+        }
+      } catch {
+        // Offline for now; the next poll tries again
+      }
+    }, STATE_POLL_INTERVAL_MS)
+    return () => clearInterval(timer)
+  }, [fetchGameState])
+
   const handleApiCall = async (endpoint: string, method: string = 'POST', body?: object) => {
     setLoading(true)
     try {
-      const response = await fetch(`${API_URL}${endpoint}`, {
-        method,
-        headers: { 'Content-Type': 'application/json' },
-        body: body ? JSON.stringify(body) : undefined,
-      })
+      // The same key is sent on every retry so the backend applies the change at most once
+      const idempotencyKey = newIdempotencyKey()
+      // return=delta makes the response carry the state it changed, saving a refetch, as long
+      // as nothing else changed the game since the revision we hold
+      const separator = endpoint.includes('?') ? '&' : '?'
+      const revision = revisionRef.current ? `&revision=${encodeURIComponent(revisionRef.current)}` : ''
+      const url = `${API_URL}${endpoint}${separator}return=delta${revision}`
+      let response: Response | null = null
+      for (let attempt = 0; response === null; attempt++) {
+        try {
+          response = await fetch(url, {
+            method,
+            headers: { 'Content-Type': 'application/json', 'Idempotency-Key': idempotencyKey },
+            body: body ? JSON.stringify(body) : undefined,
+          })
+        } catch (err) {
+          if (attempt >= MAX_REQUEST_RETRIES) throw err
+          await new Promise(resolve => setTimeout(resolve, 500 * (attempt + 1)))
+        }
+      }
       const data = await response.json()
       if (!response.ok) {
         throw new Error(data.detail || 'Request failed')
       }
-      await fetchGameState()
+      if (data.state_delta) {
+        revisionRef.current = data.revision
+        setGameState(prev => (prev ? { ...prev, ...data.state_delta, revision: data.revision } : prev))
+        if (data.transactions_replaced) {
+          replaceTransactions({ transactions: data.new_transactions, next_cursor: null, log_id: data.log_id })
+        } else {
+          appendTransactions(data.new_transactions)
+        }
+      } else {
+        await fetchGameState()
+      }
       setError(null)
       return data
     } catch (err) {
@@ -1577,38 +1777,12 @@ function App() {
               </CardTitle>
             </CardHeader>
             <CardContent>
-              <div className="overflow-x-auto">
-                <table className="w-full text-sm">
-                  <thead>
-                    <tr className="border-b">
-                      <th className="text-left p-2">Time</th>
-                      <th className="text-left p-2">Type</th>
-                      <th className="text-left p-2">From</th>
-                      <th className="text-left p-2">To</th>
-                      <th className="text-right p-2">Amount</th>
-                      <th className="text-left p-2">Description</th>
-                    </tr>
-                  </thead>
-                  <tbody>
-                    {[...transactions].reverse().map(t => (
-                      <tr key={t.id} className="border-b hover:bg-gray-50">
-                        <td className="p-2 text-gray-500">
-                          {new Date(t.timestamp).toLocaleTimeString()}
-                        </td>
-                        <td className="p-2">
-                          <Badge variant="outline" className="text-xs">
-                            {t.type}
-                          </Badge>
-                        </td>
-                        <td className="p-2">{t.from_entity}</td>
-                        <td className="p-2">{t.to_entity}</td>
-                        <td className="p-2 text-right font-medium text-green-600">£{t.amount}</td>
-                        <td className="p-2 text-gray-600">{t.description}</td>
-                      </tr>
-                    ))}
-                  </tbody>
-                </table>
-              </div>
+              <TransactionHistory
+                transactions={transactions}
+                hasOlder={transactionsCursor !== null}
+                loadingOlder={loadingOlderTransactions}
+                onLoadOlder={loadOlderTransactions}
+              />
             </CardContent>
           </Card>
         )}